@@ -5,8 +5,9 @@ Inputs are a directory of AIS files processed into heatmaps from the Spark-based
 Outputs are a directory of AIS heatmaps standardized to a common grid and reprojected to EPSG:4326.
 """
 import logging
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 
 import affine
@@ -21,6 +22,14 @@ from rasterio.enums import Resampling
 from rasterio.vrt import WarpedVRT
 from rasterio.warp import calculate_default_transform, reproject
 
+# Projection and land used by every plot, only built once
+AEA_PROJ = ccrs.AlbersEqualArea(
+    central_longitude=-154,
+    central_latitude=50,
+    standard_parallels=(55, 65)
+)
+LAND = cartopy.feature.LAND.with_scale('110m')
+
 
 @contextmanager
 def resample_raster(raster, out_path=None, scale=2):
@@ -98,6 +107,12 @@ def _make_rescale_name(input_raster: Path, version: int = 2) -> str:
     return output_fname
 
 
+def _read_bounds(path: Path) -> tuple[float, float, float, float]:
+    """Return bounds (xmin, ymin, xmax, ymax) of raster, only the metadata is read."""
+    with rasterio.open(path) as ds:
+        return tuple(ds.bounds)
+
+
 def _find_overlapping_bounds(dir: Path) -> tuple[float, float, float, float]:
     """
     Find the common bounds from a directory of rasters.
@@ -118,25 +133,18 @@ def _find_overlapping_bounds(dir: Path) -> tuple[float, float, float, float]:
     (left, bottom, right, top)
     (xmin, ymin, xmax, ymax)
     """
-    smallest_xmin = 9999999
-    smallest_ymin = 9999999
-    largest_xmax = -9999999
-    largest_ymax = -9999999
-
-    paths = Path(dir).glob('*.tif')
-    for path in paths:
-        with rasterio.open(path) as ds:
-            xmin, ymin, xmax, ymax = ds.bounds
-        if xmin < smallest_xmin:
-            smallest_xmin = xmin
-        if ymin < smallest_ymin:
-            smallest_ymin = ymin
-        if xmax > largest_xmax:
-            largest_xmax = xmax
-        if ymax > largest_ymax:
-            largest_ymax = ymax
-
-    bounds = (smallest_xmin, smallest_ymin, largest_xmax, largest_ymax)
+    paths = sorted(Path(dir).glob('*.tif'))
+    if not paths:
+        raise ValueError(f'No tifs found in {dir}')
+
+    # Opening each raster for its bounds mostly waits on disk, so read them in threads
+    with ThreadPoolExecutor() as executor:
+        all_bounds = np.array(list(executor.map(_read_bounds, paths)))
+
+    smallest_xmin, smallest_ymin = all_bounds[:, :2].min(axis=0)
+    largest_xmax, largest_ymax = all_bounds[:, 2:].max(axis=0)
+
+    bounds = (float(smallest_xmin), float(smallest_ymin), float(largest_xmax), float(largest_ymax))
     print(f'{bounds=}')
 
     return bounds
@@ -158,7 +166,7 @@ def get_vrt_options(input_dir: Path) -> Path:
         VRT options for reprojecting input rasters to a standard grid.
     """
     # Need a sample file to get resolution of input rasters
-    sample_path = Path(input_dir).glob('*.tif')[0]
+    sample_path = next(Path(input_dir).glob('*.tif'))
     with rasterio.open(sample_path) as ds:
         dst_crs = ds.crs
         if ds.res[0] != ds.res[1]:
@@ -216,11 +224,7 @@ def standardize(input_fname: Path, output_dir: Path, vrt_options: dict, ais_vers
 
     with rasterio.open(input_fname) as src:
         with WarpedVRT(src, **vrt_options) as vrt:
-            data = vrt.read()  # noqa 
-
-            for _, window in vrt.block_windows():
-                data = vrt.read(window=window)  # noqa
-
+            # Copy warps and writes the VRT block by block, no need to read it first
             print(f'saving to {output_fname}')
             rio_shutil.copy(vrt, output_fname, driver='GTiff')
 
@@ -254,8 +258,9 @@ def rescale(input_fname: Path, output_dir: Path, scale: float = 50) -> Path:
     with rasterio.Env():
         with rasterio.open(input_fname) as ds1:
             with resample_raster(ds1, scale=scale) as ds:
+                # Nodata cells (-2147483648) become 0 (no vessels) while casting, in a single pass
                 data = ds.read(1)
-                data = np.ma.masked_where(data == -2147483648, data)
+                data = np.where(data == -2147483648, 0, data).astype(rasterio.uint8)
 
                 profile = ds.profile
                 profile.update(
@@ -265,11 +270,9 @@ def rescale(input_fname: Path, output_dir: Path, scale: float = 50) -> Path:
                     nodata=0
                 )
 
-                data = data.data
-                data[data == -2147483648] = 0
                 print(f'saving to {output_tif_fname}')
                 with rasterio.open(output_tif_fname, 'w', **profile) as dst:
-                    dst.write(data.astype(rasterio.uint8), 1)
+                    dst.write(data, 1)
 
     return output_tif_fname
 
@@ -311,7 +314,7 @@ def _reproject_to_epsg4326_gdal(
     method: str = 'bilinear',
     res: float = 0.225
 ) -> Path:
-    """Reproject input raster to EPSG:4326 using gdal.
+    """Reproject input raster to EPSG:4326 using a GDAL warp (equivalent to gdalwarp).
 
     Parameters
     -----------
@@ -330,9 +333,24 @@ def _reproject_to_epsg4326_gdal(
         Path to raster with EPSG:4326 projection.
     """
     output_tif_fname = Path(output_dir) / input_fname.name
-    cmd = f'gdalwarp -t_srs EPSG:4326 -r bilinear -tr 0.225 0.25 {input_fname} {output_tif_fname}'
-    cmd = [c.strip() for c in cmd.split(' ')]
-    subprocess.run(cmd, capture_output=True)
+
+    # Same warp as `gdalwarp -t_srs EPSG:4326 -r bilinear -tr 0.225 0.25`, but run in process
+    # - Avoids starting gdalwarp (and loading GDAL/PROJ) for every file
+    # - GDAL_NUM_THREADS lets the warp kernel use every core
+    with rasterio.Env(GDAL_NUM_THREADS='ALL_CPUS'):
+        with rasterio.open(input_fname) as src:
+            transform, width, height = calculate_default_transform(
+                src.crs, 'epsg:4326', src.width, src.height, *src.bounds, resolution=(0.225, 0.25)
+            )
+            with WarpedVRT(
+                src,
+                crs='epsg:4326',
+                transform=transform,
+                width=width,
+                height=height,
+                resampling=Resampling.bilinear
+            ) as vrt:
+                rio_shutil.copy(vrt, output_tif_fname, driver='GTiff')
 
     return output_tif_fname
 
@@ -403,20 +421,11 @@ def plot(input_fname: Path, output_dir: Path, max_value: int = 5) -> None:
     output_png_fname = input_fname.name.split('.')[0] + '.png'
     output_png_fname = Path(output_dir) / output_png_fname
 
-    aea_proj = ccrs.AlbersEqualArea(
-        central_longitude=-154,
-        central_latitude=50,
-        standard_parallels=(55, 65)
-    )
-
     fig = plt.figure(figsize=(10, 10))
-    ax = plt.axes(projection=aea_proj)
+    ax = plt.axes(projection=AEA_PROJ)
     ax.coastlines()
 
-    base = plt.cm.get_cmap('pink')
-    color_list = base(np.linspace(0, 1, max_value))
-    cmap_name = base.name + str(max_value)
-    cmap = base.from_list(cmap_name, color_list, max_value)
+    cmap = _get_discrete_cmap('pink', max_value)
 
     p1 = ax.imshow(
         data,
@@ -426,16 +435,26 @@ def plot(input_fname: Path, output_dir: Path, max_value: int = 5) -> None:
             dst_bounds.bottom,
             dst_bounds.top
         ),
-        transform=aea_proj,
+        transform=AEA_PROJ,
         cmap=cmap,
         vmin=0,
         vmax=max_value,
     )
-    ax.add_feature(cartopy.feature.LAND.with_scale('110m'))
+    ax.add_feature(LAND)
     ax.gridlines(draw_labels=True)
     fig.colorbar(p1, ax=ax, shrink=0.6)
     plt.savefig(output_png_fname)
-    plt.close()
+    plt.close(fig)
+
+
+@lru_cache(maxsize=None)
+def _get_discrete_cmap(name: str, ncolors: int):
+    """Return colormap `name` with `ncolors` discrete colors, built once per (name, ncolors)."""
+    base = plt.get_cmap(name)
+    color_list = base(np.linspace(0, 1, ncolors))
+    cmap_name = base.name + str(ncolors)
+
+    return base.from_list(cmap_name, color_list, ncolors)
 
 
 if __name__ == '__main__':
@@ -475,8 +494,10 @@ if __name__ == '__main__':
     output_path = Path(args.output).resolve()
 
     if input_path.is_dir():
-        files = input_path.glob('*.tif')
+        input_dir = input_path
+        files = list(input_path.glob('*.tif'))
     else:
+        input_dir = input_path.parent
         files = [input_path]
 
     if args.number:
@@ -493,14 +514,15 @@ if __name__ == '__main__':
     if args.number:
         logger.info(f'Processing {args.number} files. ({args.number=}')
 
+    # Standard grid is shared by every file, so only read the rasters for it once
+    vrt_options = get_vrt_options(input_dir)
+
     nfiles = len(files)
     for i, file in enumerate(files):
         if file.is_symlink():
             continue
 
         logger.info(f'Processing {i} of {nfiles}: {file}')
-        if i == 0:
-            vrt_options = get_vrt_options(file)
 
         outdir = output_path / 'raw-images'
         outdir.mkdir(exist_ok=True, parents=True)
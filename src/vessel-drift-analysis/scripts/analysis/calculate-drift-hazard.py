@@ -32,7 +32,9 @@ def calculate_hazard(
         logging.info(f'- Loading results from {vessel_type} vessels')
         results.append(result_set.load_results(vessel_type, ais, esi, shorezone, **kwargs))
 
-    return pd.concat(results, ignore_index=True)
+    # - sorted so each Parquet row group covers a narrow (vessel_type, date) range and readers
+    #   filtering on either column can skip row groups using the footer statistics
+    return pd.concat(results, ignore_index=True).sort_values(['vessel_type', 'date'], ignore_index=True)
 
 
 def main(
@@ -42,17 +44,25 @@ def main(
     shorezone_path: Path,
     out_dir: Path,
     ais_year=2019,
+    ais_cache_dir: Path = None,
+    nworkers: int = 1,
 ):
     """Calculate drift hazard for all vessel types."""
     result_set = DriftResultsSet(results_dir)
-    ais_set = AISSet(ais_dir, ais_year)
+    ais_set = AISSet(ais_dir, ais_year, cache_dir=ais_cache_dir)
     esi = ESI(esi_path)
     shorezone = ShoreZone(shorezone_path)
 
-    hazard = calculate_hazard(result_set, ais_set, esi, shorezone)
+    hazard = calculate_hazard(result_set, ais_set, esi, shorezone, nworkers=nworkers)
     out_path = out_dir / 'drift_hazard.parquet'
     logging.info(f'- writing results to {out_path}')
-    hazard.to_parquet(out_path)
+    hazard.to_parquet(
+        out_path,
+        compression='zstd',
+        row_group_size=1_048_576,
+        use_dictionary=['vessel_type', 'esi_id'],
+        write_statistics=True
+    )
 
 
 if __name__ == '__main__':
@@ -64,6 +74,8 @@ if __name__ == '__main__':
     parser.add_argument('--esi_path', type=Path, required=True)
     parser.add_argument('--shorezone_path', type=Path, required=True)
     parser.add_argument('--out_dir', type=Path, required=True)
+    parser.add_argument('--ais_cache_dir', type=Path, default=None)
+    parser.add_argument('--nworkers', type=int, default=1)
     args = parser.parse_args()
 
     logging.info('Calculating drift hazard')
@@ -73,4 +85,12 @@ if __name__ == '__main__':
     logging.info(f'- ShoreZone data read from {args.shorezone_path.resolve()}')
     logging.info(f'- Writing output to {args.out_dir.resolve()}')
 
-    main(args.results_dir, args.ais_dir, args.esi_path, args.shorezone_path, args.out_dir)
+    main(
+        args.results_dir,
+        args.ais_dir,
+        args.esi_path,
+        args.shorezone_path,
+        args.out_dir,
+        ais_cache_dir=args.ais_cache_dir,
+        nworkers=args.nworkers
+    )
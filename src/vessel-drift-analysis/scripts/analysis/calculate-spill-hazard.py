@@ -24,7 +24,9 @@ def calculate_hazard(
         logging.info(f'- Loading results from {vessel_type} vessels')
         results.append(result_set.load_results(vessel_type, esi))
 
-    return pd.concat(results, ignore_index=True)
+    # - sorted so each Parquet row group covers a narrow (vessel_type, date) range and readers
+    #   filtering on either column can skip row groups using the footer statistics
+    return pd.concat(results, ignore_index=True).sort_values(['vessel_type', 'date'], ignore_index=True)
 
 
 def main(
@@ -39,7 +41,13 @@ def main(
     hazard = calculate_hazard(result_set, esi)
     out_path = out_dir / 'oil_spill_hazard.parquet'
     logging.info(f'- writing results to {out_path}')
-    hazard.to_parquet(out_path)
+    hazard.to_parquet(
+        out_path,
+        compression='zstd',
+        row_group_size=1_048_576,
+        use_dictionary=['vessel_type', 'esi_id'],
+        write_statistics=True
+    )
 
 
 if __name__ == '__main__':
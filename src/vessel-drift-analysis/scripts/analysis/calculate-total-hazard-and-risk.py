@@ -6,15 +6,40 @@ from pathlib import Path
 import geopandas as gpd
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 
-from vessel_drift_analysis.esi import clean_esi_string
+from vessel_drift_analysis.esi import clean_esi_code
 
 logging.basicConfig(format='%(process)d - %(levelname)s: %(message)s', level=logging.INFO)
 
 
+def _to_numpy_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Given DataFrame, return it with Arrow backed string and numeric columns as `str` and numpy dtypes
+
+    Notes:
+    - Dates are left as is, they are converted to datetimes after combining
+    """
+    dtypes = {}
+    for name, dtype in df.dtypes.items():
+        if not isinstance(dtype, pd.ArrowDtype):
+            continue
+        if pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype):
+            dtypes[name] = str
+        elif pa.types.is_floating(dtype.pyarrow_dtype) or pa.types.is_integer(dtype.pyarrow_dtype):
+            dtypes[name] = dtype.numpy_dtype
+
+    return df.astype(dtypes)
+
+
 def combine_hazard_results(drift_hazard: Path, spill_hazard: Path, esi: Path) -> gpd.GeoDataFrame:
     """Given drift hazard file, spill hazard file, and ESI file, return a combined GeoDataFrame."""
-    drift_df = pd.read_parquet(drift_hazard)
+    # - Only read the columns used, with Arrow dtypes for the groupby/join
+    # - Converted back to numpy dtypes once combined, so files written from the result keep the same schema
+    drift_df = pd.read_parquet(
+        drift_hazard,
+        columns=['date', 'vessel_type', 'esi_id', 'stranding_hazard', 'breach_prob'],
+        dtype_backend='pyarrow'
+    )
     # Need breach hazard, so we add that to the dataframe
     drift_df['breach_hazard'] = drift_df.stranding_hazard * drift_df.breach_prob
     # Group by date, vessel_type, and ESI segment to combine with spill results
@@ -27,7 +52,11 @@ def combine_hazard_results(drift_hazard: Path, spill_hazard: Path, esi: Path) ->
     breach_hazard = breach_hazard[breach_hazard.breach_hazard > 0]
 
     # Group the same way
-    spill_df = pd.read_parquet(spill_hazard)
+    spill_df = pd.read_parquet(
+        spill_hazard,
+        columns=['date', 'vessel_type', 'esi_id', 'oil_mass', 'cs', 'pb'],
+        dtype_backend='pyarrow'
+    )
     spill_hazard = (
         spill_df
         .groupby(['date', 'vessel_type', 'esi_id'])
@@ -40,10 +69,11 @@ def combine_hazard_results(drift_hazard: Path, spill_hazard: Path, esi: Path) ->
     total_hazard['hz_s'] = total_hazard.breach_hazard * total_hazard.pb * total_hazard.cs
 
     # Add ESI information
-    esi = gpd.read_parquet(esi)
-    total_hazard_with_esi = pd.merge(total_hazard.reset_index(), esi, on='esi_id')
+    # - Join ESI on its index to the esi_id level directly, instead of resetting the index to merge
+    esi = gpd.read_parquet(esi).set_index('esi_id')
+    total_hazard_with_esi = _to_numpy_dtypes(total_hazard.join(esi, on='esi_id', how='inner').reset_index())
     # "clean" esi values -> take the maximum for worst case scenarios
-    total_hazard_with_esi['esi'] = [clean_esi_string(esi) for esi in total_hazard_with_esi.esi]
+    total_hazard_with_esi['esi'] = clean_esi_code(total_hazard_with_esi.esi)
     # need to convert datetime.date to datetime
     total_hazard_with_esi['date'] = pd.to_datetime(total_hazard_with_esi.date)
     # Many ESI segments that were not hit are filled with NaNs, change that to 0
@@ -59,13 +89,13 @@ def main(drift_hazard: Path, spill_hazard: Path, esi: Path, out_dir: Path) -> No
 
     # Can't write out the thing as a single file because it exhausts memory
     # So, we write out the data by simulation date for all vessel types
-    for date in total_hazard.date.unique():
-        date = np.datetime_as_string(date, 'D')
+    # - groupby splits the frame by date in one pass instead of filtering it once per date
+    for date, date_hazard in total_hazard.groupby('date', sort=False):
+        date = np.datetime_as_string(np.datetime64(date), 'D')
         outpath = out_dir / f'total-hazard_{date}.parquet'
         logging.info(f'Writing out {outpath}')
-        (total_hazard
-            .query(f'date=="{date}"')
-            .to_parquet(outpath))
+        # - Parquet dictionary encodes the repeated vessel_type/esi_id values, zstd shrinks them further
+        date_hazard.to_parquet(outpath, compression='zstd', row_group_size=131072)
 
 
 if __name__ == '__main__':
@@ -2,42 +2,51 @@
 """Create files for portal ingestion from total hazard files."""
 import datetime
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
 from geopandas.io.file import infer_schema
 
-from vessel_drift_analysis.esi import ESI, clean_esi_string
+from vessel_drift_analysis.esi import ESI, clean_esi_code
 
 
 logging.basicConfig(format='%(process)d - %(levelname)s: %(message)s', level=logging.INFO)
 
 
-def esi_id_to_region(esi_id: str) -> str:
-    """Given esi_id, return the region name."""
-    regions = {
-        'aleutians': 'Aleutians',
-        'bristolbay': 'Bristol Bay',
-        'cookinlet': 'Cook Inlet',
-        'kodiak': 'Kodiak',
-        'northslope': 'North Slope',
-        'nwarctic': 'Northwest Arctic',
-        'pwsound': 'Prince William Sound',
-        'se': 'Southeast',
-        'w': 'Western'
-    }
-    return regions[esi_id.split('-')[0]]
+# ESI id prefix (<region>-<segment #>) to region name
+REGIONS = {
+    'aleutians': 'Aleutians',
+    'bristolbay': 'Bristol Bay',
+    'cookinlet': 'Cook Inlet',
+    'kodiak': 'Kodiak',
+    'northslope': 'North Slope',
+    'nwarctic': 'Northwest Arctic',
+    'pwsound': 'Prince William Sound',
+    'se': 'Southeast',
+    'w': 'Western'
+}
+
+# Columns of monthly hazard files used for portal files
+MONTHLY_COLUMNS = ['date', 'vessel_type', 'esi_id', 'esi', 'breach_hazard', 'hz_s']
+
 
+def esi_ids_to_regions(esi_ids: pd.Index) -> np.ndarray:
+    """Given esi_ids, return the region name of each with vectorized string operations."""
+    return esi_ids.str.split('-', n=1).str[0].map(REGIONS).to_numpy()
 
-def process_monthly_file(monthly_file: Path, esi: ESI) -> gpd.GeoDataFrame:
+
+def process_monthly_file(monthly_file: Path, esi_indexed: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """Given path to monthly hazard file, return a GeoDataFrame prepped for portal ingestion.
 
     Parameters
     ----------
     monthly_file: Path
         Path to a file of a GeoDataFrame of spill results of all simulations for a month.
-
+    esi_indexed: geopandas.GeoDataFrame
+        ESI segments with cleaned ESI values, indexed and sorted by `esi_id`.
 
     Notes
     -----
@@ -48,113 +57,115 @@ def process_monthly_file(monthly_file: Path, esi: ESI) -> gpd.GeoDataFrame:
     date = monthly_file.name.split('.')[0].split('_')[-1]
     date = datetime.datetime.strptime(date, '%Y-%m-%d')
 
-    monthly_data = gpd.read_parquet(monthly_file)
+    # Geometry comes from ESI, so only read the columns used here (skips decoding geometry)
+    monthly_data = pd.read_parquet(monthly_file, columns=MONTHLY_COLUMNS)
     # Add risk estimate
     # Divide ESI by 10 to place in range 0 - 1.0
     monthly_data['spill_risk'] = monthly_data['hz_s'] * monthly_data['esi'] / 10.0
 
     # Weight results for month by the number of simulations
-    nsims = len(monthly_data.date.unique())
+    nsims = monthly_data['date'].nunique()
     weighted_data = (monthly_data
         .groupby(['vessel_type', 'esi_id'])
         .agg({'breach_hazard': 'sum', 'hz_s': 'sum', 'spill_risk': 'sum'})
         .rename(columns={'hz_s': 'spill_hazard'})
     ) / nsims
 
-    # Prepare subsets for each vessel type
-    weighted_vessel_data = {}
+    # Spread vessel types into columns, (esi_id) x (term, vessel_type), so ESI is only joined once
     vessel_types = ['cargo', 'other', 'passenger', 'tanker']
-    for vessel_type in vessel_types:
-        df1 = (weighted_data
-            .reset_index()
-            .query(f'vessel_type=="{vessel_type}"')
-            .set_index('esi_id'))
-
-        df2 = esi.gdf.set_index('esi_id')
-        df2.sort_index(inplace=True)
-
-        tmp = (df2.join(
-                df1.query(f'vessel_type=="{vessel_type}"')
-            )
-            .fillna(0)
-            .drop(columns=['length', 'vessel_type'])
-        )
-        # Fill in missing values for "vessel_type" from the join
-        tmp['vessel_type'] = vessel_type
+    terms = ['breach_hazard', 'spill_hazard', 'spill_risk']
+    wide = weighted_data.unstack('vessel_type', fill_value=0.0).reindex(
+        columns=pd.MultiIndex.from_product([terms, vessel_types]),
+        fill_value=0.0
+    )
+
+    # Every ESI segment is included, segments without results are 0
+    wide = wide.reindex(esi_indexed.index, fill_value=0.0)
+
+    # Build long table ordered by vessel type (cargo, other, passenger, tanker, all) then ESI segment
+    # - 'all' is the sum of every vessel type
+    all_vessel_types = vessel_types + ['all']
+    nsegments = len(esi_indexed)
+    ntypes = len(all_vessel_types)
+    columns = {
         # I guess Oikos or the front end requires date to be formatted this way
-        tmp['date_utc'] = date.strftime('%Y-%m-%dT00:00:00')
-        tmp['region'] = [esi_id_to_region(esi_id) for esi_id in tmp.index]
-        tmp = tmp.reset_index()
-        columns = [
-            'date_utc',
-            'vessel_type',
-            'region',
-            'esi_id',
-            'esi',
-            'breach_hazard',
-            'spill_hazard',
-            'spill_risk',
-            'geometry'
-        ]
-        tmp = tmp[columns]
-        weighted_vessel_data[vessel_type] = tmp
+        'date_utc': date.strftime('%Y-%m-%dT00:00:00'),
+        'vessel_type': np.repeat(all_vessel_types, nsegments),
+        'region': np.tile(esi_ids_to_regions(esi_indexed.index), ntypes),
+        'esi_id': np.tile(esi_indexed.index.to_numpy(), ntypes),
+        'esi': np.tile(esi_indexed.esi.to_numpy(), ntypes),
+    }
+    for term in terms:
+        values = wide[term].to_numpy()
+        values = np.column_stack((values, values.sum(axis=1)))
+        # Column-major ravel puts all segments of a vessel type together
+        columns[term] = values.ravel(order='F')
+
+    return gpd.GeoDataFrame(
+        columns,
+        geometry=np.tile(esi_indexed.geometry.to_numpy(), ntypes),
+        crs=esi_indexed.crs,
+        index=np.tile(np.arange(nsegments), ntypes)
+    )
+
 
-    # Calculate results for 'all'
-    all_tmp = weighted_vessel_data[vessel_types[0]].copy()
-    for column in ['breach_hazard', 'spill_hazard', 'spill_risk']:
-        for vessel_type in vessel_types[1::]:
-            all_tmp[column] += weighted_vessel_data[vessel_type][column]
-    all_tmp['vessel_type'] = 'all'
-    weighted_vessel_data['all'] = all_tmp
+def save_region_files(region: str, region_df: gpd.GeoDataFrame, output_dir: Path, geojson: bool = False) -> None:
+    """Save combined hazard and risk for a region as Parquet (and GeoJSON if requested)."""
+    region_name = region.lower().replace(' ', '-')
 
-    # Concat all values for a month into a single DataFrame
-    return pd.concat(weighted_vessel_data.values())
+    if geojson:
+        out_path = output_dir / f'combined-hazard-risk-portal_{region_name}.geojson'
+        logging.info(f'Saving combined data for {region} to {out_path}')
+        region_df.to_file(out_path, driver='GeoJSON', engine='pyogrio')
+    out_path = output_dir / f'combined-hazard-risk-portal_{region_name}.parquet'
+    logging.info(f'Saving combined data for {region} to {out_path}')
+    region_df.to_parquet(out_path)
 
 
 def main(monthly_file_dir: Path, esi_path: Path, output_dir: Path, geojson: bool = False):
     """Create combined files of hazard and risk for use in portal."""
     # Load ESI, but use cleaned up values for ESI (max value as int)
     esi = ESI(esi_path)
-    esi.gdf['esi'] = [clean_esi_string(esi_str) for esi_str in esi.gdf.esi]
+    esi.gdf['esi'] = clean_esi_code(esi.gdf.esi)
+    # Same ESI segments are joined to every monthly file, so only index and sort them once
+    esi_indexed = esi.gdf.set_index('esi_id').sort_index()
+    # Simplify lines once per segment rather than for every month and vessel type they are copied to
+    # - Defines tolerance of simplification in native projection
+    esi_indexed['geometry'] = esi_indexed.simplify(tolerance=0.0001)
 
     files = list(monthly_file_dir.glob('total-hazard-month_*.parquet'))
     files.sort()
     monthly_dfs = []
     for file in files:
         logging.info(f'Processing {file}')
-        monthly_dfs.append(process_monthly_file(file, esi))
+        monthly_dfs.append(process_monthly_file(file, esi_indexed))
 
     combined = pd.concat(monthly_dfs)
 
-    # Finishing touches: CRS, simplifying lines, schema, etc.
+    # Finishing touches: CRS, schema, etc.
     # Need to be explicit
     combined.set_crs(epsg=4326)
-    # Defines tolerance of simplification in native projection
-    simplified_geometry = combined.simplify(tolerance=0.0001)
-    combined.geometry = simplified_geometry
     logging.info(f'Size of combined {combined.memory_usage(deep=True).sum() / 1024 / 1024} MB')
 
+    # Parquet is always written, GeoJSON (much larger and slower to write) only when asked for
     if geojson:
         out_path = output_dir / 'combined-hazard-risk-portal.geojson'
         logging.info(f'Saving combined data to {out_path}')
-        combined.to_file(out_path, driver='GeoJSON')
+        combined.to_file(out_path, driver='GeoJSON', engine='pyogrio')
     out_path = output_dir / 'combined-hazard-risk-portal_all.parquet'
     logging.info(f'Saving combined data to {out_path}')
     combined.to_parquet(out_path)
 
     # Now save files for each region
-    regions = combined.region.unique()
-    for region in regions:
-        region_df = combined.query(f'region=="{region}"')
-
-        if geojson or region == 'western':
-            out_path = output_dir / f'combined-hazard-risk-portal_{region}.geojson'
-            logging.info(f'Saving combined data for {region} to {out_path}')
-            combined.to_file(out_path, driver='GeoJSON')
-        region_name = region.lower().replace(' ', '-')
-        out_path = output_dir / f'combined-hazard-risk-portal_{region_name}.parquet'
-        logging.info(f'Saving combined data for {region} to {out_path}')
-        region_df.to_parquet(out_path)
+    # - groupby splits the combined frame in one pass, and the writes (mostly encoding and
+    #   compression outside the GIL) are run in threads
+    with ThreadPoolExecutor() as executor:
+        futures = [
+            executor.submit(save_region_files, region, region_df, output_dir, geojson)
+            for region, region_df in combined.groupby('region', sort=False)
+        ]
+        for future in futures:
+            future.result()
 
 
 if __name__ == '__main__':
@@ -175,5 +186,10 @@ if __name__ == '__main__':
         type=Path,
         help='Path to directory to save outputs'
     )
+    parser.add_argument(
+        '--geojson',
+        action='store_true',
+        help='Also save GeoJSON files (Parquet files are always saved)'
+    )
     args = parser.parse_args()
-    main(args.monthly_file_dir, args.esi_path, args.out_dir)
\ No newline at end of file
+    main(args.monthly_file_dir, args.esi_path, args.out_dir, args.geojson)
\ No newline at end of file
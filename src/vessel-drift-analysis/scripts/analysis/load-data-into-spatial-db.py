@@ -41,12 +41,14 @@ def load_file(hazard_file_path: Path, db_engine: sqlalchemy.engine.Engine) -> No
     }
     gdf = gpd.read_parquet(hazard_file_path)
     logging.info(f'Loading {hazard_file_path} as {layer_name}')
+    # to_postgis loads rows with COPY ... FROM STDIN, so send the whole file as a single COPY
+    # instead of one COPY (and round trip) per 1000 rows
     gdf.to_postgis(
         layer_name,
         db_engine,
         schema=SCHEMA_NAME,
         if_exists='replace',
-        chunksize=1000,
+        chunksize=None,
         dtype=dtypes
     )
 
@@ -37,7 +37,8 @@ def get_region(fpath):
 
 
 def convert_and_clean_shapefile(fpath, out_dir=out_dir):
-    df = gpd.read_file(fpath)
+    # pyogrio with Arrow reads the shapefile in columnar batches instead of feature by feature
+    df = gpd.read_file(fpath, engine='pyogrio', use_arrow=True)
     # Drop unnecessary columns
     df.drop(columns=DROP_COLUMNS, inplace=True)
     df.rename(columns=RENAME_COLUMNS, inplace=True)
@@ -50,7 +51,7 @@ def convert_and_clean_shapefile(fpath, out_dir=out_dir):
     # Write as new file
     out_file = out_dir / f'{region_name}-cleaned.geojson'
     logging.info(f'Writing {out_file}')
-    df.to_file(out_file, driver='GeoJSON')
+    df.to_file(out_file, driver='GeoJSON', engine='pyogrio')
 
 
 for fpath in esil_files:
@@ -59,14 +60,14 @@ for fpath in esil_files:
 
 # Load all cleaned files
 geojson_files = out_dir.glob('*-cleaned.geojson')
-dfs = [gpd.read_file(f) for f in geojson_files]
+dfs = [gpd.read_file(f, engine='pyogrio', use_arrow=True) for f in geojson_files]
 combined_gdf = gpd.GeoDataFrame(pd.concat(dfs, ignore_index=True))
 
 logging.info(f'Reading files from {base_dir}')
 
 geojson_file = out_dir / 'combined-esi.geojson'
 logging.info(f'Writing {geojson_file}')
-combined_gdf.to_file(geojson_file, driver='GeoJSON')
+combined_gdf.to_file(geojson_file, driver='GeoJSON', engine='pyogrio')
 logging.info(f'Writing {geojson_file}')
 parquet_file = out_dir / 'combined-esi.parquet'
 combined_gdf.to_parquet(parquet_file)
@@ -1,8 +1,8 @@
 #!python
 """Extract HYCOM surface u, v files"""
-import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from multiprocessing import Pool
-from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
 from nco import Nco
@@ -46,15 +46,21 @@ def _extract(fname, outdir):
     outdir = Path(outdir)
     outfile = outdir / fname.name
 
-# ugh - failing for some reason.
-#    subproc = subprocess.Popen(
-#        f'ncks -d lat,45.0,75.0 -d lon,160.0,220.0 -d depth,0 -v water_u,water_v {fname} {outfile}',
-#        stdout=subprocess.PIPE,
-#        stderr=subprocess.PIPE,
-#        shell=True
-#    )
-#    stdout, stderr = subproc.communicate()
-    os.system(f'ncks -d lat,45.0,75.0 -d lon,160.0,220.0 -d depth,0 -v water_u,water_v,water_temp,salinity,sic,siu,siv {fname} {outfile}')
+    # Run ncks directly (no shell) so failures raise instead of being ignored
+    # - `-L 4` deflates the output files
+    cmd = [
+        'ncks',
+        '-d', 'lat,45.0,75.0',
+        '-d', 'lon,160.0,220.0',
+        '-d', 'depth,0',
+        '-v', 'water_u,water_v,water_temp,salinity,sic,siu,siv',
+        '-L', '4',
+        str(fname),
+        str(outfile)
+    ]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+
+    return outfile
 
 
 def extract_uv_surface(basedir=BASEDIR, outdir=OUTDIR, nworkers=10):
@@ -63,16 +69,24 @@ def extract_uv_surface(basedir=BASEDIR, outdir=OUTDIR, nworkers=10):
     files = basedir.glob('**/*.nc')
     files = list(files)
 
-    thread_pool = ThreadPool(nworkers)
-
-    for file in files:
-        print(file)
-#        _extract(file, outdir)
-
-        thread_pool.apply_async(_extract, (file, outdir))
-
-    thread_pool.close()
-    thread_pool.join()
+    # Work is done by ncks subprocesses, so threads are enough to run them in parallel
+    with ThreadPoolExecutor(max_workers=nworkers) as executor:
+        futures = {executor.submit(_extract, file, outdir): file for file in files}
+        failed = []
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                print(future.result())
+            except subprocess.CalledProcessError as e:
+                print(f'Failed to extract {file}: {e}')
+                failed.append(file)
+
+    # - exit with an error so a partial set of extracted files is not mistaken for a complete one
+    if failed:
+        print(f'Failed to extract {len(failed)} of {len(files)} files:')
+        for file in sorted(failed):
+            print(f'  {file}')
+        raise SystemExit(1)
 
 
 if __name__ == '__main__':
@@ -1,8 +1,8 @@
 #!python
 """NAM 10 m winds"""
-import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from multiprocessing import Pool
-from multiprocessing.pool import ThreadPool
 from pathlib import Path
 
 from nco import Nco
@@ -78,9 +78,22 @@ def _extract(fname, outdir):
     outdir = Path(outdir)
     outfile = outdir / fname.name
 
-    os.system(f'ncks -4 -O -d height_above_ground4,0 -v wind_u,wind_v {fname} {outfile}')
-    os.system(f'ncks -O -C -x -v height_above_ground4 {outfile} {outfile}')
-    os.system(f'ncwa -O -a height_above_ground4 {outfile} {outfile}')
+    # Single ncwa pass (no shell) instead of ncks -> ncks -> ncwa round trips through outfile
+    # - `-d` keeps the 10 m level, averaging over the now single level height dimension removes it
+    # - `-C` is not used, time/x/y coordinates are needed to reproject the winds
+    cmd = [
+        'ncwa',
+        '-4',
+        '-O',
+        '-d', 'height_above_ground4,0',
+        '-v', 'wind_u,wind_v',
+        '-a', 'height_above_ground4',
+        str(fname),
+        str(outfile)
+    ]
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+
+    return outfile
 
 
 def extract_uv_surface(basedir=BASEDIR, outdir=OUTDIR, nworkers=10):
@@ -90,14 +103,24 @@ def extract_uv_surface(basedir=BASEDIR, outdir=OUTDIR, nworkers=10):
     files = list(files)
     files.sort()
 
-    thread_pool = ThreadPool(nworkers)
-
-    for file in files:
-        print(file)
-        thread_pool.apply_async(_extract, (file, outdir))
-
-    thread_pool.close()
-    thread_pool.join()
+    # Work is done by ncwa subprocesses, so threads are enough to run them in parallel
+    with ThreadPoolExecutor(max_workers=nworkers) as executor:
+        futures = {executor.submit(_extract, file, outdir): file for file in files}
+        failed = []
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                print(future.result())
+            except subprocess.CalledProcessError as e:
+                print(f'Failed to extract {file}: {e}')
+                failed.append(file)
+
+    # - exit with an error so a partial set of extracted files is not mistaken for a complete one
+    if failed:
+        print(f'Failed to extract {len(failed)} of {len(files)} files:')
+        for file in sorted(failed):
+            print(f'  {file}')
+        raise SystemExit(1)
 
 
 if __name__ == '__main__':
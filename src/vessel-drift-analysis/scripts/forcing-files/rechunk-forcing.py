@@ -0,0 +1,77 @@
+#!python
+# Rewrite forcing files (HYCOM, NAM) chunked by timestep and spatial tile, and compressed
+# - OpenDrift readers read one timestep at a time over the bounding box of active particles,
+#   so each chunk holds a single timestep of a spatial tile instead of long time series.
+import logging
+from pathlib import Path
+
+import xarray as xr
+
+TILE_SIZE = 256
+
+
+def _chunksizes(var: xr.Variable, tile_size: int) -> tuple:
+    """Return chunk shape of one timestep, tile_size x tile_size horizontally, one level otherwise"""
+    chunks = []
+    for i, size in enumerate(var.shape):
+        # - assume horizontal dims are the last two (e.g. (time, depth, lat, lon))
+        if i >= var.ndim - 2:
+            chunks.append(min(tile_size, size))
+        else:
+            chunks.append(1)
+
+    return tuple(chunks)
+
+
+def rechunk_forcing(forcing_file: Path, outfile: Path, tile_size: int = TILE_SIZE) -> Path:
+    """Given path to forcing file, save copy chunked per timestep and spatial tile to outfile."""
+    outfile.parent.mkdir(exist_ok=True, parents=True)
+
+    with xr.open_dataset(forcing_file, decode_cf=False) as ds:
+        encoding = {}
+        for name, var in ds.data_vars.items():
+            # only gridded fields that vary in time are read per timestep by OpenDrift
+            if 'time' not in var.dims or var.ndim < 3:
+                continue
+            encoding[name] = {
+                'chunksizes': _chunksizes(var, tile_size),
+                'zlib': True,
+                'complevel': 1,
+                'shuffle': True
+            }
+        ds.to_netcdf(outfile, encoding=encoding)
+
+    return outfile
+
+
+def main(forcing_file, outfile, tile_size=TILE_SIZE):
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    logging.info(f'Rechunking {forcing_file} to {outfile}')
+    rechunk_forcing(forcing_file, outfile, tile_size)
+    logging.info(f'Rechunked forcing saved to {outfile}')
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'forcing_file',
+        type=Path,
+        help='Forcing file (e.g. hycom.nc or nam.nc)'
+    )
+    parser.add_argument(
+        'outfile',
+        type=Path,
+        help='Path to save rechunked forcing file'
+    )
+    parser.add_argument(
+        '--tile_size',
+        type=int,
+        default=TILE_SIZE,
+        help='Number of grid cells per side of the horizontal chunk, every chunk holds one timestep'
+    )
+    args = parser.parse_args()
+    main(args.forcing_file.resolve(), args.outfile.resolve(), args.tile_size)
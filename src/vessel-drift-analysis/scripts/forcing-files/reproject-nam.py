@@ -1,5 +1,7 @@
 #!python
 """Reproject NAM files for NPS vessel drift to lan/lon for use with OpenDrift"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import List, Tuple
 
@@ -21,13 +23,23 @@ def get_files(dir: str, glob_str: str) -> List[Path]:
 
 def _nam_meshgrid(fname: str) -> Tuple[np.array, np.array]:
     """Given NAM file path, return meshgrid of locations in m"""
-    with xr.open_dataset(fname) as ds:
+    # - only the x/y coordinates are needed, skip decoding times
+    with xr.open_dataset(fname, decode_times=False) as ds:
         # multiple by 1000 to convert from km to m
-        xx, yy = np.meshgrid(ds.x * 1000, ds.y * 1000)
+        x = ds.x.values * 1000
+        y = ds.y.values * 1000
+    # - sparse grid broadcast as views, the only full 2D arrays are the transformed lat/lon
+    xx, yy = np.broadcast_arrays(*np.meshgrid(x, y, sparse=True))
 
     return xx, yy
 
 
+@lru_cache
+def _get_transformer(src_crs: pyproj.crs.CRS, dst_crs: str) -> Transformer:
+    """Return transformer between CRS, only built once per pair"""
+    return Transformer.from_crs(src_crs, dst_crs)
+
+
 def _nam_latlons(
     fname: str,
     src_crs: pyproj.crs.CRS = NAM_PROJ,
@@ -35,8 +47,7 @@ def _nam_latlons(
 ) -> Tuple[np.array, np.array]:
     """Given NAM file path, return meshgrid of locations in lat/lon [0, 360]"""
     xx, yy = _nam_meshgrid(fname)
-    xformer = Transformer.from_crs(src_crs, dst_crs)
-    lat, lon = xformer.transform(xx, yy)
+    lat, lon = _get_transformer(src_crs, dst_crs).transform(xx, yy)
     lon = lon % 360
 
     return lat, lon
@@ -44,14 +55,17 @@ def _nam_latlons(
 
 def _fixtimes(ds: xr.Dataset) -> Tuple[np.array, np.array, np.array]:
     """Given a NAM dataset, fix the arrays and return as type"""
-    ixs = np.argsort(ds.time.values)
-    new_time = np.zeros_like(ds.time)
-    new_u = np.zeros_like(ds.wind_u)
-    new_v = np.zeros_like(ds.wind_v)
-    for i, ix in enumerate(ixs):
-        new_time[i] = ds.time.values[ix]
-        new_u[i, :, :] = ds.wind_u[ix, :, :]
-        new_v[i, :, :] = ds.wind_v[ix, :, :]
+    time = ds.time.values
+    # - NAM files are usually already in time order, skip copying the wind arrays then
+    if np.all(time[1:] >= time[:-1]):
+        return time, ds.wind_u.values, ds.wind_v.values
+
+    # - stable sort, fast on nearly sorted input (e.g. a single out of place forecast hour)
+    ixs = np.argsort(time, kind='mergesort')
+    # - single gather along the time axis, reorders every timestep at once
+    new_time = time[ixs]
+    new_u = ds.wind_u.values[ixs]
+    new_v = ds.wind_v.values[ixs]
 
     return new_time, new_u, new_v
 
@@ -66,6 +80,9 @@ def _reproject_file(
     outname = outfile_prefix + fname.name
     out_fname = outdir / outname
     with xr.open_dataset(fname) as src_ds:
+        # - only the winds (and their time coordinate) are needed, read each in one bulk read
+        #   before reordering instead of pulling them lazily per access
+        src_ds = src_ds[['wind_u', 'wind_v']].load()
         new_time, new_u, new_v = _fixtimes(src_ds)
         ds = xr.Dataset(
             {
@@ -123,15 +140,25 @@ def _reproject_file(
                 )
             },
         )
-        ds.to_netcdf(out_fname)
+        # - OpenDrift reads the wind field a timestep at a time, so chunk by single timesteps
+        _, ny, nx = new_u.shape
+        wind_encoding = {'zlib': True, 'complevel': 1, 'shuffle': True, 'chunksizes': (1, ny, nx)}
+        ds.to_netcdf(out_fname, encoding={'wind_u': wind_encoding, 'wind_v': wind_encoding})
 
 
-def reproject_files(dir):
+def reproject_files(dir, nworkers=1):
     files = get_files(dir, 'alaska_hires_2019-*.nc')
     lat, lon = _nam_latlons(files[0])
-    for file in files:
-        print(file)
-        _reproject_file(file, lat, lon)
+    if nworkers > 1:
+        # Files are independent, so reproject them in a pool of processes
+        with ProcessPoolExecutor(max_workers=min(nworkers, len(files))) as executor:
+            reproject = partial(_reproject_file, lat=lat, lon=lon)
+            for file, _ in zip(files, executor.map(reproject, files)):
+                print(file)
+    else:
+        for file in files:
+            print(file)
+            _reproject_file(file, lat, lon)
 
 
 if __name__ == '__main__':
@@ -142,6 +169,12 @@ if __name__ == '__main__':
         type=str,
         help='directory with NAM data'
     )
+    parser.add_argument(
+        '--nworkers',
+        type=int,
+        default=1,
+        help='number of files to reproject in parallel'
+    )
     args = parser.parse_args()
     print(f'Reprojecting data in {args.data_dir}')
-    reproject_files(args.data_dir)
+    reproject_files(args.data_dir, args.nworkers)
@@ -5,6 +5,7 @@ from pathlib import Path
 
 import geopandas
 import numpy as np
+import pandas as pd
 import rasterio
 import xarray as xr
 from rasterio import features
@@ -12,6 +13,8 @@ from rasterio import features
 # All analysis performed on the 25 km x 25 km grid in Alaska Albers Equal Area Projection
 REFERENCE_TIF = '/mnt/store/data/assets/nps-vessel-spills/ais-data/ais-data-2015-2020/processed_25km/2019/rescale/all_20190101-20190201_total.tif'
 
+# Variables of simulation output used to make rasters
+SIM_VARIABLES = ('lon', 'lat', 'status')
 
 
 def get_stranded_flag(ds: xr.Dataset) -> int:
@@ -40,7 +43,8 @@ def lon_to_epsg4326(lon: np.ndarray) -> np.ndarray:
 def load_sim_output(fpath: Path, out_crs: str) -> geopandas.GeoDataFrame:
     """Given path to OpenDrift output and WKT string, return results as GeoDataFrame"""
     with xr.open_dataset(fpath) as ds:
-        df = ds.to_dataframe()
+        # Only read the variables used to make rasters, every (trajectory, time) is a row
+        df = pd.DataFrame({name: ds[name].values.ravel() for name in SIM_VARIABLES})
 
     # lon in (-180, 180)
     df.lon = lon_to_epsg4326(df.lon)
@@ -1,6 +1,7 @@
 #!python
 """Create rasters of outputs of OpenDrift simulation results."""
 import logging
+from functools import lru_cache
 from pathlib import Path
 
 import cartopy
@@ -41,16 +42,15 @@ def lon_to_epsg4326(lon: np.ndarray) -> np.ndarray:
     return np.mod(lon - 180, 360) - 180
 
 
+@lru_cache
+def _get_transformer(in_crs: str, out_crs: str) -> pyproj.Transformer:
+    """Return (lon, lat) ordered transformer between CRS, only built once per pair"""
+    return pyproj.Transformer.from_crs(in_crs, out_crs, always_xy=True)
+
+
 def bin_results(lon, lat, bins, in_crs='epsg:4326', out_crs='epsg:3338'):
     """Given bins [x, y], lon, lat, return positions binned for raster."""
-    in_proj = pyproj.Proj(init=in_crs)
-    out_proj = pyproj.Proj(init=out_crs)
-    x, y = pyproj.transform(
-        in_proj,
-        out_proj,
-        lon,
-        lat,
-    )
+    x, y = _get_transformer(in_crs, out_crs).transform(lon, lat)
     h, _, _ = np.histogram2d(x, y, bins=(bins.x, bins.y))
 
     # gotta rotate 90 to align with rasters correctly
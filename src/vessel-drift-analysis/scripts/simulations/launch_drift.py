@@ -12,7 +12,12 @@ direction is randomly assigned per simulated vessel.
 import datetime
 import logging
 import time
-from dataclasses import dataclass
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 from typing import List
 
@@ -21,11 +26,12 @@ import rasterio
 from opendrift.models.basemodel import OpenDriftSimulation
 from opendrift.models.oceandrift import LagrangianArray
 from opendrift.readers import reader_netCDF_CF_generic, reader_shape
-from rasterio import warp
+from pyproj import Transformer
 
 logging.basicConfig(level=logging.WARNING)
 RANGE_LIMIT_RADS = 60 * np.pi / 180
 TIF_DIR = '/mnt/store/data/assets/nps-vessel-spills/ais-data/ais-data-2015-2020/processed_25km/2019/epsg4326'
+VESSEL_TYPES = ['cargo', 'other', 'passenger', 'tanker']
 
 
 class Vessel(LagrangianArray):
@@ -77,16 +83,16 @@ class AlaskaDrift(OpenDriftSimulation):
         if number is None:
             number = self.get_config('seed:number_of_elements')
 
+        # One generator per simulation, created from `seed` on first seeding
+        if not hasattr(self, '_rng'):
+            self._rng = np.random.default_rng(seed)
+
+        # wind scale and offset drawn together in a single batch
+        samples = self._rng.random((2, number))
         # drift is going to be a random value between 2% - 10% of wind
-        # (b - a) * random_sample + a
-        # a = 0.02
-        # b = 0.1
-        wind_scale = (0.1 - 0.02) * np.random.random_sample((number,)) + 0.02
+        wind_scale = (0.1 - 0.02) * samples[0] + 0.02
         # offset is -60 deg. to 60 deg.
-        # a = -60
-        # b = 60
-        # (60 - (-60)) * random_sample + (-60)
-        wind_offset = (range_limit_rads + range_limit_rads) * np.random.random_sample((number,)) - range_limit_rads # noqa
+        wind_offset = (range_limit_rads + range_limit_rads) * samples[1] - range_limit_rads
 
         super(AlaskaDrift, self).seed_elements(
             lon=lon,
@@ -115,28 +121,28 @@ class AlaskaDrift(OpenDriftSimulation):
             k_ice = 0
             factor_stokes = 1
 
+        # Share of movement not taken up by ice, computed once for both wind and currents
+        one_minus_k_ice = 1 - k_ice
+
         # 1. update wind
-        windspeed = np.sqrt(self.environment.x_wind**2 + self.environment.y_wind**2)
-        windspeed *= self.elements.wind_scale
-
-        # update angle using random offset +- 60 deg
-        # windir is in rads, so need to convert
-        winddir = np.arctan2(self.environment.y_wind, self.environment.x_wind)
-        winddir += self.elements.wind_offset
-        wind_x = windspeed * np.cos(winddir)
-        wind_y = windspeed * np.sin(winddir)
-
-        # Scale wind by ice factor
-        wind_x = wind_x * (1 - k_ice)
-        wind_y = wind_y * (1 - k_ice)
+        # Rotate the wind vector by the random offset +- 60 deg (rads) and scale it,
+        # same as recomposing speed/direction but without arctan2/sqrt on every element
+        # - wind is also scaled by ice factor
+        x_wind = self.environment.x_wind
+        y_wind = self.environment.y_wind
+        cos_offset = np.cos(self.elements.wind_offset)
+        sin_offset = np.sin(self.elements.wind_offset)
+        scale = self.elements.wind_scale * one_minus_k_ice
+        wind_x = scale * (x_wind * cos_offset - y_wind * sin_offset)
+        wind_y = scale * (x_wind * sin_offset + y_wind * cos_offset)
         self.update_positions(wind_x, wind_y)
 
         # 2. update with sea_water_velocity
         # This assumes x_sea_water_velocity and not eastward_sea_water_velocity...
         #self.advect_ocean_current(factor=1 - k_ice)
         self.update_positions(
-            self.environment.eastward_sea_water_velocity * (1 - k_ice),
-            self.environment.northward_sea_water_velocity * (1 - k_ice)
+            self.environment.eastward_sea_water_velocity * one_minus_k_ice,
+            self.environment.northward_sea_water_velocity * one_minus_k_ice
         )
 
         # 3. Advect with ice
@@ -161,103 +167,63 @@ class SimulationConfig:
     duration: datetime.timedelta = datetime.timedelta(days=7)
     outfile: str = None
     loglevel: int = logging.INFO
+    tif_index: dict = None  # (vessel_type, 'YYYYMM') -> AIS tif, see `index_ais_tifs`
+
+
+def index_ais_tifs(tif_dir) -> dict:
+    """Return AIS tif paths in tif_dir keyed by (vessel_type, 'YYYYMM' of the first day)"""
+    tif_index = {}
+    # Assume name template: "{vessel_type}_{year}{month:02}01-{end_year}{end_month:02}01_total.tif"
+    # - other tifs in the dir (e.g. without a vessel type or date range) are skipped
+    for path in sorted(Path(tif_dir).glob('*_*-*.tif')):
+        vessel_type, dates, *_ = path.name.split('_')
+        if not dates[:6].isdigit():
+            continue
+        tif_index.setdefault((vessel_type, dates[:6]), path)
+
+    return tif_index
+
+
+@lru_cache
+def _get_transformer(src_crs_wkt: str, dst_crs_wkt: str) -> Transformer:
+    """Return (x, y) ordered transformer between CRS, only built once per pair"""
+    return Transformer.from_crs(src_crs_wkt, dst_crs_wkt, always_xy=True)
 
 
 def lonlat_from_tif(date, tif_file, dst_crs=rasterio.crs.CRS.from_epsg(4326)):
     """Return (lon, lat) in TIFF with cell value > 0"""
     with rasterio.open(tif_file) as ds:
         src_crs = ds.crs
-        idx = np.argwhere(ds.read(1))
-        x, y = ds.xy(idx[:, 0], idx[:, 1])
-
-        lon, lat = warp.transform(
-            src_crs,
-            dst_crs,
-            x,
-            y
-        )
-        # need to change from [-180, 180] to [0, 360]
-        lon = np.array(lon) % 360
-        lat = np.array(lat)
+        xs = []
+        ys = []
+        # AIS rasters are mostly zeros, so read a block at a time and only keep non-zero cells
+        for _, window in ds.block_windows(1):
+            rows, cols = np.nonzero(ds.read(1, window=window))
+            # apply the block's affine transform to the cell centers directly as arrays
+            block_x, block_y = ds.window_transform(window) * (cols + 0.5, rows + 0.5)
+            xs.append(block_x)
+            ys.append(block_y)
+        x = np.concatenate(xs).astype(np.float64)
+        y = np.concatenate(ys).astype(np.float64)
+
+        lon, lat = _get_transformer(src_crs.to_wkt(), dst_crs.to_wkt()).transform(x, y)
+        # need to change from [-180, 180] to [0, 360], in place on the transformed array
+        np.mod(lon, 360, out=lon)
 
     return lon, lat
 
 
-# ~2 min per test
-def run_sims_for_date(run_config, tif_dir=TIF_DIR):
-    vessel_types = ['cargo', 'other', 'passenger', 'tanker']
+def sim_seed(vessel_type: str, start_date: datetime.datetime, base_seed: int = 187) -> np.random.SeedSequence:
+    """Return seed for the simulation of a vessel type starting on start_date
 
-    # Run simulation using data for start date for every vessel type
-    month = run_config.start_date.month
-
-    tif_files = list(Path(tif_dir).glob('*.tif'))
-    tif_files.sort()
-
-    base_fname = run_config.outfile
-    for vessel_type in vessel_types:
-        try:
-            tif_file = list(Path(tif_dir).glob(f'{vessel_type}_2019{month:02}01-2019*.tif'))[0]
-        except IndexError:
-            if month == 12:
-                tif_file = list(Path(tif_dir).glob(f'{vessel_type}_2019{month:02}01-2020*.tif'))[0]
-            else:
-                raise IndexError(f"No AIS data found for {month}")
-
-        logging.info(f'Starting simulation preparation for {tif_file=}')
-
-        vessel_type = tif_file.name.split('.')[0].split('_')[0]
-        # prepend out name with vessel type
-        outfile = vessel_type + '_' + base_fname
-
-        # release points from each ais location where a vessel was in the past
-        lons, lats = lonlat_from_tif(run_config.start_date, tif_file)
-
-        # launch vessel simulation
-        vessel_sim = AlaskaDrift(loglevel=run_config.loglevel)
-        vessel_sim.add_reader(run_config.readers)
-        for i in range(run_config.number):
-            vessel_sim.seed_elements(
-                lon=lons,
-                lat=lats,
-                time=run_config.start_date,
-                number=len(lons),
-                radius=run_config.radius
-            )
-        # Disabling the automatic GSHHG landmask
-        vessel_sim.set_config('general:use_auto_landmask', False)
-
-        # Backup velocities
-        vessel_sim.set_config('environment:fallback:sea_ice_area_fraction', 0)
-        vessel_sim.set_config('environment:fallback:northward_sea_ice_velocity', 0)
-        vessel_sim.set_config('environment:fallback:eastward_sea_ice_velocity', 0)
-        vessel_sim.set_config('environment:fallback:northward_sea_water_velocity', 0)
-        vessel_sim.set_config('environment:fallback:eastward_sea_water_velocity', 0)
-        vessel_sim.set_config('environment:fallback:x_wind', 0)
-        vessel_sim.set_config('environment:fallback:y_wind', 0)
-        vessel_sim.run(
-            time_step=run_config.time_step,
-            time_step_output=run_config.time_step_output,
-            duration=run_config.duration,
-            outfile=outfile
-        )
+    Every run draws independent wind scales/offsets, but reruns of the same simulation are reproducible.
+    - crc32 instead of hash() as str hashes are randomized per process
+    """
+    return np.random.SeedSequence([base_seed, start_date.toordinal(), zlib.crc32(vessel_type.encode())])
 
 
-def run_simulations(
-    days=7,
-    number=50,
-    radius=5000,
-    timestep=900,
-    output_timestep=3600,
-    tif_dir=TIF_DIR,
-    loglevel=logging.INFO
-):
-    # start date possible to launch drifter, limited by availability of HYCOM data
-    start_date = datetime.datetime(2019, 1, 8)
-    # last date possible to launch drifter, limited by availability of NAM data (2019-12-17)
-    last_date = datetime.datetime(2019, 12, 10)
-    date = start_date
-    duration = datetime.timedelta(days=days)
-
+def build_readers() -> List:
+    """Return OpenDrift readers for currents, ice, winds, and land used by every simulation"""
     # currents + ice
     hycom_file = '/mnt/store/data/assets/nps-vessel-spills/forcing-files/hycom/final-files/hycom.nc'
     # Provide a name mapping to work with package methods:
@@ -279,34 +245,154 @@ def run_simulations(
     reader_landmask = reader_shape.Reader.from_shpfiles(fname)
 
     # Reader order matters.  first reader sets the projection for the simulation.
-    readers = [hycom_reader, nam_reader, reader_landmask]
+    return [hycom_reader, nam_reader, reader_landmask]
+
+
+def _run_vessel_sim(vessel_type, run_config, tif_dir=TIF_DIR):
+    """Run drift simulation for a vessel type released from its AIS locations, return output file"""
+    month = run_config.start_date.month
+    tif_index = run_config.tif_index if run_config.tif_index is not None else index_ais_tifs(tif_dir)
+    try:
+        tif_file = tif_index[(vessel_type, f'2019{month:02}')]
+    except KeyError:
+        raise IndexError(f"No AIS data found for {month}")
+
+    logging.info(f'Starting simulation preparation for {tif_file=}')
+
+    vessel_type = tif_file.name.split('.')[0].split('_')[0]
+    # prepend out name with vessel type
+    outfile = vessel_type + '_' + run_config.outfile
+
+    # release points from each ais location where a vessel was in the past
+    lons, lats = lonlat_from_tif(run_config.start_date, tif_file)
+
+    # launch vessel simulation
+    vessel_sim = AlaskaDrift(loglevel=run_config.loglevel)
+    vessel_sim.add_reader(run_config.readers)
+    # seed `number` vessels per release point in a single call (one draw of wind scale/offset)
+    release_lons = np.tile(lons, run_config.number)
+    release_lats = np.tile(lats, run_config.number)
+    vessel_sim.seed_elements(
+        lon=release_lons,
+        lat=release_lats,
+        time=run_config.start_date,
+        number=release_lons.size,
+        radius=run_config.radius,
+        seed=sim_seed(vessel_type, run_config.start_date)
+    )
+    # Disabling the automatic GSHHG landmask
+    vessel_sim.set_config('general:use_auto_landmask', False)
+
+    # Backup velocities
+    vessel_sim.set_config('environment:fallback:sea_ice_area_fraction', 0)
+    vessel_sim.set_config('environment:fallback:northward_sea_ice_velocity', 0)
+    vessel_sim.set_config('environment:fallback:eastward_sea_ice_velocity', 0)
+    vessel_sim.set_config('environment:fallback:northward_sea_water_velocity', 0)
+    vessel_sim.set_config('environment:fallback:eastward_sea_water_velocity', 0)
+    vessel_sim.set_config('environment:fallback:x_wind', 0)
+    vessel_sim.set_config('environment:fallback:y_wind', 0)
+    vessel_sim.run(
+        time_step=run_config.time_step,
+        time_step_output=run_config.time_step_output,
+        duration=run_config.duration,
+        outfile=outfile
+    )
+
+    return outfile
+
+
+# Readers shared by every simulation run in a worker process of `run_simulations`
+# - readers hold open netCDF handles, so each worker builds its own instead of receiving copies
+_sim_worker_readers: list = []
+
+
+def _init_sim_worker() -> None:
+    """Build readers once per worker process."""
+    _sim_worker_readers.extend(build_readers())
+
+
+def _run_worker_vessel_sim(vessel_type, run_config, tif_dir):
+    """Run vessel simulation in worker process with the worker's readers."""
+    return _run_vessel_sim(vessel_type, replace(run_config, readers=_sim_worker_readers), tif_dir)
+
+
+# ~2 min per test
+def run_sims_for_date(run_config, tif_dir=TIF_DIR, executor=None):
+    """Run drift simulations for every vessel type starting on `run_config.start_date`.
+
+    Vessel types are independent, so when given a ProcessPoolExecutor (with workers started
+    by `_init_sim_worker`) they are run in its pool of processes.
+    """
+    if executor is not None:
+        return list(executor.map(
+            _run_worker_vessel_sim,
+            VESSEL_TYPES,
+            repeat(replace(run_config, readers=None)),
+            repeat(tif_dir)
+        ))
+
+    return [_run_vessel_sim(vessel_type, run_config, tif_dir) for vessel_type in VESSEL_TYPES]
+
+
+def run_simulations(
+    days=7,
+    number=50,
+    radius=5000,
+    timestep=900,
+    output_timestep=3600,
+    tif_dir=TIF_DIR,
+    loglevel=logging.INFO,
+    nworkers=1
+):
+    # start date possible to launch drifter, limited by availability of HYCOM data
+    start_date = datetime.datetime(2019, 1, 8)
+    # last date possible to launch drifter, limited by availability of NAM data (2019-12-17)
+    last_date = datetime.datetime(2019, 12, 10)
+    date = start_date
+    duration = datetime.timedelta(days=days)
+
+    # - with a pool of processes each worker builds its own readers
+    readers = build_readers() if nworkers <= 1 else None
+    # find AIS files once instead of scanning tif_dir for every simulation
+    tif_index = index_ais_tifs(tif_dir)
+
+    # - one pool for the whole run, so workers and their readers are only started once
+    if nworkers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=min(nworkers, len(VESSEL_TYPES)),
+            initializer=_init_sim_worker
+        )
+    else:
+        pool = nullcontext()
 
     sim_start_time = time.perf_counter()
-    while date <= last_date:
-        try:
-            logging.info(f'simulation started for {date:%Y-%m-%d}')
-            start_time = time.perf_counter()
-            output_fname = f'alaska_drift_{date:%Y-%m-%d}.nc'
-            config = SimulationConfig(
-                date,
-                readers,
-                number,
-                radius,
-                timestep,
-                output_timestep,
-                duration,
-                output_fname,
-                loglevel
-            )
-            run_sims_for_date(config, tif_dir)
-            end_time = time.perf_counter()
-            total_time = int(end_time - start_time)
-            logging.info(f'simulation complete {total_time} s')
-        except Exception as e:
-            logging.warning(f'simulation failed for {date:%Y-%m-%d}')
-            logging.warning(str(e))
-
-        date = date + datetime.timedelta(days=days)
+    with pool as executor:
+        while date <= last_date:
+            try:
+                logging.info(f'simulation started for {date:%Y-%m-%d}')
+                start_time = time.perf_counter()
+                output_fname = f'alaska_drift_{date:%Y-%m-%d}.nc'
+                config = SimulationConfig(
+                    date,
+                    readers,
+                    number,
+                    radius,
+                    timestep,
+                    output_timestep,
+                    duration,
+                    output_fname,
+                    loglevel,
+                    tif_index
+                )
+                run_sims_for_date(config, tif_dir, executor)
+                end_time = time.perf_counter()
+                total_time = int(end_time - start_time)
+                logging.info(f'simulation complete {total_time} s')
+            except Exception as e:
+                logging.warning(f'simulation failed for {date:%Y-%m-%d}')
+                logging.warning(str(e))
+
+            date = date + datetime.timedelta(days=days)
 
     sim_end_time = time.perf_counter()
     total_sim_time = int(sim_end_time - sim_start_time)
@@ -337,6 +423,12 @@ def main():
         type=str,
         help='Path to dir with AIS tifs for release points'
     )
+    parser.add_argument(
+        '--nworkers',
+        default=1,
+        type=int,
+        help='Number of vessel type simulations to run in parallel'
+    )
     args = parser.parse_args()
     run_simulations(
         days=7,
@@ -345,7 +437,8 @@ def main():
         timestep=900,
         output_timestep=86400,
         tif_dir=args.ais,
-        loglevel=logging.INFO
+        loglevel=logging.INFO,
+        nworkers=args.nworkers
     )
 
 
@@ -22,7 +22,8 @@ import datetime
 import logging
 import time
 from collections import namedtuple
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import List
 
@@ -52,7 +53,8 @@ class SimulationConfig:
 # - Guidance on amount of oil by vessel types, but focused values typical for Puget Sound.
 # - Broadly applicable for this purpose, however.
 # - Worst case scenarios numbers
-SpillConfig = namedtuple('spill_config', ['type', 'amount'])
+# - typename matches the module attribute so configs can be pickled to worker processes
+SpillConfig = namedtuple('SpillConfig', ['type', 'amount'])
 GAL_TO_M3 = 0.003785
 OIL_CONFIGS = {
     'cargo': SpillConfig('MARINE INTERMEDIATE FUEL OIL', 2_000_000 * GAL_TO_M3),
@@ -133,6 +135,50 @@ def run_sim(run_config, oil_configs, vessel_type):
     return total_time
 
 
+def build_readers() -> List:
+    """Return OpenDrift readers for currents, winds, and land used by every simulation"""
+    # currents
+    hycom_file = '/mnt/store/data/assets/nps-vessel-spills/forcing-files/hycom/final-files/hycom.nc'
+    hycom_reader = reader_netCDF_CF_generic.Reader(hycom_file)
+
+    # winds
+    fname = '/mnt/store/data/assets/nps-vessel-spills/forcing-files/nam/regrid/nam.nc'
+    nam_reader = reader_netCDF_CF_generic.Reader(fname)
+
+    # land - cannot use default landmask as it is -180, 180
+    # Instead, we use the same landmask with lons shifted to 0, 360
+    fname = '/mnt/store/data/assets/nps-vessel-spills/sim-scripts/drift/world_0_360.shp'
+    reader_landmask = reader_shape.Reader.from_shpfiles(fname)
+
+    # Reader order matters.  first reader sets the projection for the simulation.
+    return [hycom_reader, nam_reader, reader_landmask]
+
+
+def _try_run_sim(run_config, oil_configs, vessel_type):
+    """Run simulation, logging instead of raising on failure so other simulations continue"""
+    try:
+        logging.info(f'launching simulation for {vessel_type} starting on {run_config.start_date:%Y-%m-%d}')
+        return run_sim(run_config, oil_configs, vessel_type)
+    except Exception as e:
+        logging.warning(f'simulation failed for {run_config.start_date:%Y-%m-%d}')
+        logging.warning(str(e))
+
+
+# Readers shared by every simulation run in a worker process of `run_simulations`
+# - readers hold open netCDF handles, so each worker builds its own instead of receiving copies
+_sim_worker_readers: list = []
+
+
+def _init_sim_worker() -> None:
+    """Build readers once per worker process."""
+    _sim_worker_readers.extend(build_readers())
+
+
+def _run_worker_sim(run_config, oil_configs, vessel_type):
+    """Run simulation in worker process with the worker's readers."""
+    return _try_run_sim(replace(run_config, readers=_sim_worker_readers), oil_configs, vessel_type)
+
+
 def run_simulations(
     days=7,
     number=100,
@@ -143,8 +189,13 @@ def run_simulations(
     oil_configs=OIL_CONFIGS,
     loglevel=logging.INFO,
     grounding_dir=None,
-    start_date=None
+    start_date=None,
+    nworkers=1
 ):
+    """Run oil spill simulations for every week and vessel type.
+
+    Simulations are independent, so with `nworkers` > 1 they are run in a pool of processes.
+    """
     if type(vessel_types) is str:
         vessel_types = [vessel_types]
 
@@ -159,48 +210,40 @@ def run_simulations(
     date = start_date
     duration = datetime.timedelta(days=days)
 
-    # currents
-    hycom_file = '/mnt/store/data/assets/nps-vessel-spills/forcing-files/hycom/final-files/hycom.nc'
-    hycom_reader = reader_netCDF_CF_generic.Reader(hycom_file)
-
-    # winds
-    fname = '/mnt/store/data/assets/nps-vessel-spills/forcing-files/nam/regrid/nam.nc'
-    nam_reader = reader_netCDF_CF_generic.Reader(fname)
-
-    # land - cannot use default landmask as it is -180, 180
-    # Instead, we use the same landmask with lons shifted to 0, 360
-    fname = '/mnt/store/data/assets/nps-vessel-spills/sim-scripts/drift/world_0_360.shp'
-    reader_landmask = reader_shape.Reader.from_shpfiles(fname)
-
-    # Reader order matters.  first reader sets the projection for the simulation.
-    readers = [hycom_reader, nam_reader, reader_landmask]
-
-    sim_start_time = time.perf_counter()
+    configs = []
     while date <= last_date:
         for vessel_type in vessel_types:
-            try:
-                logging.info(f'launching simulation for {vessel_type} starting on {date:%Y-%m-%d}')
-                output_fname = f'oilspill_{vessel_type}_{date:%Y-%m-%d}.nc'
-                config = SimulationConfig(
-                    date,
-                    readers,
-                    number,
-                    radius,
-                    timestep,
-                    output_timestep,
-                    duration,
-                    output_fname,
-                    loglevel,
-                    grounding_dir
-                )
-                run_sim(config, oil_configs, vessel_type)
-
-            except Exception as e:
-                logging.warning(f'simulation failed for {date:%Y-%m-%d}')
-                logging.warning(str(e))
+            output_fname = f'oilspill_{vessel_type}_{date:%Y-%m-%d}.nc'
+            config = SimulationConfig(
+                date,
+                None,
+                number,
+                radius,
+                timestep,
+                output_timestep,
+                duration,
+                output_fname,
+                loglevel,
+                grounding_dir
+            )
+            configs.append((config, vessel_type))
 
         date = date + datetime.timedelta(days=days)
 
+    sim_start_time = time.perf_counter()
+    if nworkers > 1:
+        with ProcessPoolExecutor(max_workers=min(nworkers, len(configs)), initializer=_init_sim_worker) as executor:
+            list(executor.map(
+                _run_worker_sim,
+                [config for config, _ in configs],
+                [oil_configs] * len(configs),
+                [vessel_type for _, vessel_type in configs]
+            ))
+    else:
+        readers = build_readers()
+        for config, vessel_type in configs:
+            _try_run_sim(replace(config, readers=readers), oil_configs, vessel_type)
+
     sim_end_time = time.perf_counter()
     total_sim_time = int(sim_end_time - sim_start_time)
     logging.info(f'total sim time {total_sim_time} s')
@@ -240,6 +283,12 @@ def main():
         type=str,
         help='Specify simulation start time (%Y-%m-%d)'
     )
+    parser.add_argument(
+        '--nworkers',
+        default=1,
+        type=int,
+        help='Number of simulations to run in parallel'
+    )
     args = parser.parse_args()
 
     if args.start_date is not None:
@@ -256,7 +305,8 @@ def main():
         vessel_types=args.vessel_type,
         loglevel=logging.INFO,
         grounding_dir=args.grounding_dir,
-        start_date=start_date
+        start_date=start_date,
+        nworkers=args.nworkers
     )
 
 
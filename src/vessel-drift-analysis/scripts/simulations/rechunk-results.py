@@ -0,0 +1,77 @@
+#!python
+# Rewrite OpenDrift results chunked by trajectory (all times per chunk) and compressed
+# - OpenDrift writes (trajectory, time) variables unchunked, so reading a subset of particles
+#   reads far more of the file than needed. Chunks holding every time step for a block of
+#   trajectories keep each particle's history together for the analysis reads.
+import logging
+from pathlib import Path
+
+import xarray as xr
+
+CHUNK_TRAJECTORIES = 1024
+
+
+def rechunk_result(opendrift_file: Path, outdir: Path, chunk_trajectories: int = CHUNK_TRAJECTORIES) -> Path:
+    """Given path to OpenDrift result file, save copy chunked as (chunk_trajectories, ntime) to outdir."""
+    outdir.mkdir(exist_ok=True, parents=True)
+    outfile = outdir / opendrift_file.name
+
+    with xr.open_dataset(opendrift_file, decode_cf=False) as ds:
+        ntrajectories = ds.sizes['trajectory']
+        ntimes = ds.sizes['time']
+        encoding = {}
+        for name, var in ds.data_vars.items():
+            if var.dims != ('trajectory', 'time'):
+                continue
+            encoding[name] = {
+                'chunksizes': (min(chunk_trajectories, ntrajectories), ntimes),
+                'zlib': True,
+                'complevel': 1,
+            }
+        ds.to_netcdf(outfile, encoding=encoding)
+
+    return outfile
+
+
+def main(indir, outdir, chunk_trajectories=CHUNK_TRAJECTORIES):
+    # results are rewritten with the same file name, so writing into indir would clobber the input
+    if Path(outdir).resolve() == Path(indir).resolve():
+        raise ValueError(f'outdir must be different from indir ({indir})')
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    logging.info(f'Rechunking results from {indir} and saving to {outdir}')
+
+    results_files = indir.glob('*.nc')
+    for result_file in results_files:
+        try:
+            logging.info(f'Rechunking {result_file}')
+            out_file = rechunk_result(result_file, outdir, chunk_trajectories)
+            logging.info(f'Rechunked result saved to {out_file}')
+        except Exception:
+            logging.exception(f'Problem rechunking {result_file}')
+
+
+if __name__ == '__main__':
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'indir',
+        type=Path,
+        help='Directory with OpenDrift results'
+    )
+    parser.add_argument(
+        'outdir',
+        type=Path,
+        help='Directory to save rechunked results'
+    )
+    parser.add_argument(
+        '--chunk_trajectories',
+        type=int,
+        default=CHUNK_TRAJECTORIES,
+        help='Number of trajectories per chunk, every chunk holds all time steps'
+    )
+    args = parser.parse_args()
+    main(args.indir.resolve(), args.outdir.resolve(), args.chunk_trajectories)
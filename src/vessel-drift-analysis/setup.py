@@ -12,5 +12,7 @@ setup(
     author_email='jesse@axds.co',
     description=DESCRIPTION,
     packages=find_packages(),
+    # pykdtree is optional, utils.KDTree falls back to scipy without it
+    extras_require={'fast': ['pykdtree']},
     scripts=[str(p) for p in Path('scripts').glob('**/*.py')],
 )
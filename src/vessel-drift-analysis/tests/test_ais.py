@@ -38,6 +38,8 @@ class TestAIS:
 
     def test_ais_counts(self):
         # 216 pixels in example with vessel count greater than 0
+        assert len(self.ais.counts) == 216
+        assert len(self.ais.lon) == len(self.ais.lat) == 216
         assert len(self.ais.vessel_counts) == 216
 
     def test_ais_tree(self):
@@ -47,4 +49,16 @@ class TestAIS:
         # - Also, pattern for looking up points
         homer = np.array((-151.5483333, 59.6425))
         _, homer_ix = self.ais.tree.query(homer)
-        assert self.ais.vessel_counts.iloc[homer_ix].counts == 255
+        assert self.ais.counts[homer_ix] == 255
+
+    def test_ais_cache(self, tmp_path):
+        cached = AIS(AIS_FILE, cache_dir=tmp_path)
+        assert (tmp_path / f'{cached.path.name}.npz').exists()
+        # Second load reads vessel counts from the cache instead of the raster
+        from_cache = AIS(AIS_FILE, cache_dir=tmp_path)
+        assert np.array_equal(from_cache.counts, self.ais.counts)
+        assert np.array_equal(from_cache.lon, self.ais.lon)
+        assert np.array_equal(from_cache.lat, self.ais.lat)
+        assert from_cache.max_distance == self.ais.max_distance
+        # Cache is moved into place after writing, no temporary files are left behind
+        assert [p.name for p in tmp_path.iterdir()] == [f'{cached.path.name}.npz']
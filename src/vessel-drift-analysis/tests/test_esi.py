@@ -1,6 +1,7 @@
 import numpy as np
+import pandas as pd
 
-from vessel_drift_analysis.esi import ESI
+from vessel_drift_analysis.esi import ESI, clean_esi_code
 
 ESI_PATH = "/mnt/store/data/assets/nps-vessel-spills/spatial-division/esi/cleaned-and-combined/combined-esi.parquet"  # noqa
 
@@ -19,3 +20,9 @@ class TestESI:
         # ESI codes must be in range [1, 10]
         assert np.sum(self.esi.locs.esi_code == 0) == 0
         assert np.array_equal(np.sort(self.esi.locs.esi_code.unique()), np.arange(1, 11))
+
+
+def test_clean_esi_code():
+    esi_column = pd.Series(['1A', '3B/6A', None, '10D', '1A'])
+    # Letters are stripped, highest code is used, and missing codes are 5
+    assert np.array_equal(clean_esi_code(esi_column), [1, 6, 5, 10, 1])
@@ -46,7 +46,6 @@ class TestSpillResults:
         assert len(oil_mass) == NPARTICLES
 
     def test_calc_concentration_index(self):
-        breakpoint()
         concentration_index = self.spill_result._calc_concentration_index(self.esi)
         assert len(concentration_index) == NESI_SEGMENTS
         assert concentration_index.oil_mass.min() >= 0.0
@@ -55,7 +54,6 @@ class TestSpillResults:
         assert concentration_index.cs.max() <= 1.0
 
     def test_init(self):
-        breakpoint()
         assert len(self.spill_result.data) == NESI_SEGMENTS
 
         assert self.spill_result.data.oil_mass.min() >= 0.0
@@ -1,3 +1,9 @@
+import pickle
+
+import numpy as np
+import pytest
+from scipy.spatial import cKDTree
+
 from vessel_drift_analysis import utils
 
 
@@ -5,3 +11,57 @@ def test_lon360_to_lon180():
     assert utils.lon360_to_lon180(200) == -160
     assert utils.lon360_to_lon180(180) == -180
     assert utils.lon360_to_lon180(360) == 0
+
+
+def test_kdtree_query():
+    points = np.array([[-151.5, 59.6], [-149.9, 61.2], [-165.4, 64.5]])
+    tree = utils.KDTree(points)
+
+    # Single point returns scalar index, like scipy.spatial.cKDTree
+    _, ix = tree.query(np.array((-150.0, 61.0)))
+    assert ix == 1
+
+    # Batch of points returns an index for each point
+    _, ix = tree.query(np.array([[-165.0, 64.0], [-151.0, 59.0]]), workers=-1)
+    assert np.array_equal(ix, [2, 0])
+
+    # Points beyond the upper bound are not matched
+    dist, ix = tree.query(np.array([[-151.4, 59.6], [-120.0, 30.0]]), distance_upper_bound=1.0)
+    assert ix[0] == 0 and ix[1] == len(points)
+    assert np.isfinite(dist[0]) and np.isinf(dist[1])
+
+
+def test_kdtree_pykdtree_matches_ckdtree():
+    pytest.importorskip('pykdtree')
+    rng = np.random.default_rng(0)
+    points = rng.uniform((-170.0, 50.0), (-130.0, 72.0), size=(500, 2))
+    tree = utils.KDTree(points)
+    assert isinstance(tree._tree, utils.PyKDTree)
+    expected_tree = cKDTree(points)
+
+    # float32 queries are cast to the dtype of the tree
+    queries = rng.uniform((-170.0, 50.0), (-130.0, 72.0), size=(100, 2)).astype('f4')
+    dist, ix = tree.query(queries)
+    expected_dist, expected_ix = expected_tree.query(queries.astype('f8'))
+    assert np.array_equal(ix, expected_ix)
+    assert np.allclose(dist, expected_dist)
+
+    # Single point is reshaped and returns scalars
+    dist, ix = tree.query(queries[0])
+    assert np.ndim(ix) == 0 and ix == expected_ix[0]
+    assert np.isclose(dist, expected_dist[0])
+
+    # Bounded misses follow cKDTree: index of len(data) and distance of inf
+    far = np.array([[-100.0, 30.0], [-110.0, 20.0]])
+    dist, ix = tree.query(np.vstack([queries[:2], far]), distance_upper_bound=1.0)
+    expected_dist, expected_ix = expected_tree.query(np.vstack([queries[:2], far]), distance_upper_bound=1.0)
+    assert np.array_equal(ix, expected_ix)
+    assert np.array_equal(ix[2:], [len(points), len(points)])
+    assert np.all(np.isinf(dist[2:]))
+    assert np.allclose(dist[:2], expected_dist[:2])
+
+    # Pickling sends the points and rebuilds the tree
+    unpickled = pickle.loads(pickle.dumps(tree))
+    assert isinstance(unpickled._tree, utils.PyKDTree)
+    assert np.array_equal(unpickled.data, points)
+    assert np.array_equal(unpickled.query(queries)[1], tree.query(queries)[1])
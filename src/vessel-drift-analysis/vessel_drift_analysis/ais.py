@@ -1,11 +1,17 @@
 # Data container for AIS rasters used to launch drift simulations and analysis.
+import calendar
 import datetime
+import os
+import tempfile
+from functools import cached_property
 from pathlib import Path
+from typing import Optional, Tuple, Union
 
 import geopandas as gpd
 import numpy as np
 import rasterio
-from scipy.spatial.ckdtree import cKDTree
+
+from .utils import KDTree
 
 VESSEL_TYPES = [
     'cargo',
@@ -27,6 +33,8 @@ class AISSet:
         Year of AIS data to use.
     vessel_types: list
         List of vessel types as reflected in the AIS file names.
+    cache_dir: Path
+        Directory to cache vessel counts read from AIS files in. (Default: None, no caching)
 
     Attributes:
     -----------
@@ -34,56 +42,91 @@ class AISSet:
         List of paths to each AIS file.
     """
 
-    def __init__(self, ais_dir: Path, year: int, vessel_types: list = VESSEL_TYPES):
+    def __init__(
+        self,
+        ais_dir: Path,
+        year: int,
+        vessel_types: list = VESSEL_TYPES,
+        cache_dir: Optional[Path] = None
+    ):
         self.dir = Path(ais_dir)
         self.vessel_types = vessel_types
         self.year = year
-        self.paths = self._get_ais_paths()
-
-    def _get_ais_paths(self) -> list:
-        """Given path to directory with AIS data, return list of paths to files"""
-        ais_files = []
-        year = self.year
-        end_year = self.year
+        self.cache_dir = cache_dir
+        # path -> AIS, each AIS file is shared by every simulation started in the same month
+        self._ais_by_path: dict = {}
+        # (vessel_type, month) -> path, to look up AIS file for a simulation without scanning paths
+        self._paths_by_month = self._get_ais_paths()
+        self.paths = list(self._paths_by_month.values())
+
+    def _get_ais_paths(self) -> dict:
+        """Given path to directory with AIS data, return paths to files keyed by (vessel_type, month)"""
+        paths = {}
         for month in range(1, 13):
-            end_month = month + 1
-            if month == 12:
-                end_year += 1
-                end_month = 1
-
+            # AIS files end on the first day of the following month (December ends in the next year)
+            end_year = self.year + month // 12
+            end_month = month % 12 + 1
             for vessel_type in self.vessel_types:
-                path_template = f"{vessel_type}_{year}{month:02}01-{end_year}{end_month:02}01_total.tif"
-                fname = self.dir / path_template
-                ais_files.append(fname)
+                fname = f"{vessel_type}_{self.year}{month:02}01-{end_year}{end_month:02}01_total.tif"
+                paths[(vessel_type, month)] = self.dir / fname
 
-        return ais_files
+        return paths
 
     def get_ais_path(self, vessel_type: str, simulation_date: datetime.date) -> Path:
         """Given vessel_type and simulation date, return path to AIS raster"""
-        # adjust date to match AIS file naming convention
-        file_date = f"{self.year}{simulation_date.month:02}01"
+        # AIS files are monthly for `year`, so only the month of the simulation date is used
+        return self._paths_by_month[(vessel_type, simulation_date.month)]
 
-        for path in self.paths:
-            if vessel_type in path.name and file_date in path.name:
-                break
+    def get_ais(self, vessel_type: str, simulation_date: datetime.date) -> 'AIS':
+        """Given vessel_type and simulation date, return AIS data container, only loading each file once"""
+        path = self.get_ais_path(vessel_type, simulation_date)
+        if path not in self._ais_by_path:
+            self._ais_by_path[path] = AIS(path, self.cache_dir)
 
-        return path
+        return self._ais_by_path[path]
 
 
 class AIS:
     """
     Container for AIS raster data.
+
+    Attributes:
+    -----------
+    counts: np.ndarray
+        Vessel count of every cell with a vessel (non-zero count).
+    lon: np.ndarray
+        Longitude of every cell with a vessel.
+    lat: np.ndarray
+        Latitude of every cell with a vessel.
+    tree: vessel_drift_analysis.utils.KDTree
+        Tree to query closest cell with a vessel, indices line up with `counts`, `lon`, and `lat`.
+    ndays_in_month: int
+        Number of days in the month of the AIS data.
+    max_distance: float
+        Distance (degrees) beyond which a point is considered to have no vessels, two cells
+        of the raster.
     """
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, cache_dir: Optional[Union[Path, str]] = None):
         self.path = Path(path)
         self.date = self._get_date()
+        self.ndays_in_month = calendar.monthrange(self.date.year, self.date.month)[1]
         self.vessel_type = self._get_vessel_type()
-        self.vessel_counts = self._load_vessel_counts()
-        locs = np.vstack((
-            self.vessel_counts.lon.values,
-            self.vessel_counts.lat.values
-        )).T
-        self.tree = cKDTree(locs)
+        self.counts, self.lon, self.lat, pixel_size = self._load_cached_vessel_counts(cache_dir)
+        self.tree = KDTree(np.column_stack((self.lon, self.lat)))
+        self.max_distance = 2 * pixel_size
+
+    @cached_property
+    def vessel_counts(self) -> gpd.GeoDataFrame:
+        """Vessel counts and locations as GeoDataFrame, only built when needed (e.g. plotting)"""
+        gdf = gpd.GeoDataFrame(
+            {
+                'counts': self.counts,
+                'lon': self.lon,
+                'lat': self.lat
+            },
+            geometry=gpd.points_from_xy(self.lon, self.lat)
+        )
+        return gdf.set_crs('epsg:4326')
 
     def _get_vessel_type(self) -> str:
         name = self.path.name
@@ -99,22 +142,63 @@ class AIS:
 
         return datetime.datetime.strptime(date, '%Y%m%d')
 
-    def _load_vessel_counts(self, crs: str = 'epsg:4326') -> gpd.GeoDataFrame:
-        """Load vessel counts and return locations as GeoDataFrame"""
+    def _get_pixel_size(self) -> float:
+        """Return largest side of a raster cell in degrees (only reads the raster header)"""
+        with rasterio.open(self.path) as raster:
+            return float(max(abs(res) for res in raster.res))
+
+    def _load_cached_vessel_counts(
+        self,
+        cache_dir: Optional[Union[Path, str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """Load (counts, lon, lat, pixel_size) from cache_dir if cached after the raster was modified,
+        otherwise read and cache"""
+        if cache_dir is None:
+            return (*self._load_vessel_counts(), self._get_pixel_size())
+
+        cache_path = Path(cache_dir) / f'{self.path.name}.npz'
+        if cache_path.exists() and cache_path.stat().st_mtime >= self.path.stat().st_mtime:
+            with np.load(cache_path) as cached:
+                # - caches written before pixel size was stored are rebuilt
+                if 'pixel_size' in cached.files:
+                    return cached['counts'], cached['lon'], cached['lat'], float(cached['pixel_size'])
+
+        counts, lon, lat = self._load_vessel_counts()
+        pixel_size = self._get_pixel_size()
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file and move it into place, so other processes loading the same
+        # file never read a partially written cache
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.npz.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, counts=counts, lon=lon, lat=lat, pixel_size=pixel_size)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        return counts, lon, lat, pixel_size
+
+    def _load_vessel_counts(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Load vessel counts and return (counts, lon, lat) of cells with vessels as arrays"""
+        lons = []
+        lats = []
+        block_counts = []
         with rasterio.open(self.path) as raster:
-            vessel_counts = raster.read(1)
-
-            # get locations where there were vessels (non-zero counts)
-            non_zero_ix = np.argwhere(vessel_counts > 0)
-            lon, lat = raster.xy(non_zero_ix[:, 0], non_zero_ix[:, 1])
-            counts = vessel_counts[non_zero_ix[:, 0], non_zero_ix[:, 1]]
-
-            gdf = gpd.GeoDataFrame(
-                {
-                    'counts': counts,
-                    'lon': lon,
-                    'lat': lat
-                },
-                geometry=gpd.points_from_xy(lon, lat)
-            )
-            return gdf.set_crs(crs)
+            # Rasters are mostly zeros, so read a block at a time and only keep non-zero cells
+            for _, window in raster.block_windows(1):
+                vessel_counts = raster.read(1, window=window)
+
+                # get locations where there were vessels (non-zero counts)
+                rows, cols = np.nonzero(vessel_counts > 0)
+                # apply the block's affine transform to the cell centers directly as arrays
+                block_lon, block_lat = raster.window_transform(window) * (cols + 0.5, rows + 0.5)
+                lons.append(block_lon)
+                lats.append(block_lat)
+                block_counts.append(vessel_counts[rows, cols])
+
+        counts = np.concatenate(block_counts).astype(np.int32)
+        lon = np.concatenate(lons).astype(np.float64)
+        lat = np.concatenate(lats).astype(np.float64)
+
+        return counts, lon, lat
@@ -1,9 +1,10 @@
 # Container for drift result simulations
-import calendar
 import datetime
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
 from pathlib import Path
-from typing import Union, DefaultDict
+from typing import Iterator, Optional, Tuple, Union
 
 import geopandas as gpd
 import numpy as np
@@ -102,8 +103,10 @@ class DriftResult:
             Simulation start date.
         """
         # Use first time step in file to ensure we get the correct starting time
-        with xr.open_dataset(self.path) as ds:
-            date = ds.time[0].dt.date.data.item()
+        # - Only decode the first time step instead of every time in the file
+        with xr.open_dataset(self.path, decode_times=False) as ds:
+            time = xr.decode_cf(ds[['time']].isel(time=slice(0, 1))).time
+            date = time[0].dt.date.data.item()
 
         return date
 
@@ -133,31 +136,35 @@ class DriftResult:
         drift_hazard: pandas.DataFrame
             Terms and regions associated with drift hazard calculations on a per particle basis.
         """
+        # Read the variables needed by every term once instead of re-opening the file for each
+        with self._open_dataset() as ds:
+            ds = ds[['status', 'lon', 'lat']].load()
+
         # Probability of vessel at release point r (Pt_r)
-        pt = self._calc_pt_per_particle(ais, **kwargs)
+        pt = self._calc_pt_per_particle(ais, ds=ds, **kwargs)
+
+        # Array of segment codes per particle (-1 if not stranded), shared by the terms below
+        esi_codes = self._get_esi_code_per_particle(esi, ds=ds, **kwargs)
 
         # Probability of vessel drifting and stranded on some ESI segment s (Pb_s)
-        pb = self._calc_pb_per_particle(esi, **kwargs)
+        pb = self._calc_pb_per_particle(esi, esi_codes=esi_codes)
 
         # Probability of vessel drifting and stranding
         stranding_hazard = pt * pb * prob_drift
 
         # Add fields useful for grouping in analysis
-        esi_per_particle = self._get_esi_per_particle(esi, **kwargs)
-        # Change empty ESI IDs from '' to None
-        esi_per_particle[esi_per_particle == ''] = None
+        # - Segment codes are only converted to ESI IDs here, non-stranded particles are missing
+        esi_per_particle = pd.Series(esi.segment_ids.to_numpy()[esi_codes])
+        esi_per_particle = esi_per_particle.mask(esi_codes < 0)
 
         # ESI IDs are <region>-<segment #>, so we break the region out for convenience
-        # - loop to deal with non-stranding ESI IDs
-        region_per_particle: list[Union[str, None]] = []
-        for particle_esi_id in esi_per_particle:
-            if particle_esi_id is None:
-                region_per_particle.append(None)
-            else:
-                region_per_particle.append(particle_esi_id.split('-')[0])
+        # - Split each unique segment once and index by code rather than splitting every particle
+        # - missing values (non-stranding particles) are passed through as missing
+        segment_regions = esi.segment_ids.str.split('-', n=1).str[0].to_numpy()
+        region_per_particle = pd.Series(segment_regions[esi_codes]).mask(esi_codes < 0)
 
         # Add probability that vessel will breach based on Shorezone data about coastline
-        breach_prob = self._calc_breach_prob_per_particle(shorezone)
+        breach_prob = self._calc_breach_prob_per_particle(shorezone, ds=ds)
 
         # Return all factors, stranding risk, and breaching probability in a single DataFrame
         df = pd.DataFrame(
@@ -166,8 +173,8 @@ class DriftResult:
                 'pb': pb,
                 'stranding_hazard': stranding_hazard,
                 'breach_prob': breach_prob,
-                'esi_id': esi_per_particle,
-                'region': region_per_particle,
+                'esi_id': esi_per_particle.to_numpy(),
+                'region': region_per_particle.to_numpy(),
             },
             index=np.arange(len(pt))
         )
@@ -175,7 +182,58 @@ class DriftResult:
 
         return df
 
-    def _get_starting_points(self, crs: str = 'epsg:4326', convert_lon: bool = True) -> gpd.GeoDataFrame:
+    @contextmanager
+    def _open_dataset(self, ds: Optional[xr.Dataset] = None) -> Iterator[xr.Dataset]:
+        """Yield `ds` if already loaded, otherwise open the simulation result file.
+
+        Parameters
+        ----------
+        ds: xarray.Dataset
+            Simulation results already read from `path`. (Default: None)
+        """
+        if ds is not None:
+            yield ds
+        else:
+            # - Only raw status, lon, and lat are used, so skip CF decoding (times, masking, scaling)
+            with xr.open_dataset(self.path, decode_cf=False) as ds:
+                yield ds
+
+    def _get_starting_locs(
+        self,
+        convert_lon: bool = True,
+        ds: Optional[xr.Dataset] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return drifting vessel starting locations (lon, lat) from simulation.
+
+        Parameters
+        ----------
+        convert_lon: bool
+            Convert longitude values from 0 to 360 to -180 to 180.
+        ds: xarray.Dataset
+            Simulation results already read from `path`. (Default: None)
+
+        Returns
+        -------
+        lon, lat: tuple of np.ndarray
+            Starting longitude and latitude for each particle in simulation.
+        """
+        with self._open_dataset(ds) as ds:
+            lon = ds.lon.isel(time=0).values
+            lat = ds.lat.isel(time=0).values
+
+        # Aleutian project uses [0, 360) instead of [-180, 180) to avoid dateline issues
+        # - Convert back to [-180, 180)
+        if convert_lon:
+            lon = utils.lon360_to_lon180(lon)
+
+        return lon, lat
+
+    def _get_starting_points(
+        self,
+        crs: str = 'epsg:4326',
+        convert_lon: bool = True,
+        ds: Optional[xr.Dataset] = None
+    ) -> gpd.GeoDataFrame:
         """Return drifting vessel starting points from simulation.
 
         Parameters
@@ -184,32 +242,76 @@ class DriftResult:
             Coordinate reference system of simulation output. Typically 'epsg:4326'.
         convert_lon: bool
             Convert longitude values from 0 to 360 to -180 to 180.
+        ds: xarray.Dataset
+            Simulation results already read from `path`. (Default: None)
 
         Returns
         -------
         starting_points: geopandas.GeoDataFrame
             GeoDataFrame of starting points for each particle in simulation indexed by particle number.
         """
-        with xr.open_dataset(self.path) as ds:
-            ds0 = ds.isel(time=0)
-
-        df = ds0.to_dataframe()
-
-        # Aleutian project uses [0, 360) instead of [-180, 180) to avoid dateline issues
-        # - Convert back to [-180, 180)
-        if convert_lon:
-            df.lon = utils.lon360_to_lon180(df.lon)
+        lon, lat = self._get_starting_locs(convert_lon, ds)
 
         gdf = gpd.GeoDataFrame(
-            df,
-            geometry=gpd.points_from_xy(df.lon, df.lat)
+            {'lon': lon, 'lat': lat},
+            geometry=gpd.points_from_xy(lon, lat)
         )
         return gdf.set_crs(crs)
 
+    def _get_stranded_locs(
+        self,
+        convert_lon: bool = True,
+        ds: Optional[xr.Dataset] = None
+    ) -> Tuple[int, np.ndarray, np.ndarray]:
+        """Return number of vessels, and index and first stranding location (lon, lat) of stranded vessels.
+
+        Parameters
+        ----------
+        convert_lon: bool
+            Convert longitude values from 0 to 360 to -180 to 180. (Default: True)
+        ds: xarray.Dataset
+            Simulation results already read from `path`. (Default: None)
+
+        Returns
+        -------
+        nvessels: int
+            Number of vessels in simulation.
+        vessel_ix: np.ndarray
+            Index of each stranded vessel.
+        locs: np.ndarray
+            (N, 2) array of first stranding location (lon, lat) of each stranded vessel.
+        """
+        with self._open_dataset(ds) as ds:
+            stranded_flag = utils.get_stranded_flag_from_status(ds)
+            nvessels = ds.sizes['trajectory']
+
+            # Get indices in dataset of where vessels are stranded
+            # - A vessel can be flagged stranded for several time steps, only its first stranding
+            #   is used so each vessel is looked up once
+            stranded = ds.status.values == stranded_flag
+            vessel_ix = np.flatnonzero(stranded.any(axis=1))
+            time_ix = stranded[vessel_ix].argmax(axis=1)
+
+            # Get stranding locations from dataset using indices
+            # - Pointwise selection only reads the stranded positions, not the full (trajectory, time) arrays
+            stranded_points = ds[['lon', 'lat']].isel(
+                trajectory=xr.DataArray(vessel_ix, dims='stranding'),
+                time=xr.DataArray(time_ix, dims='stranding')
+            )
+            lons = stranded_points.lon.values
+            lats = stranded_points.lat.values
+
+        if convert_lon:
+            lons = utils.lon360_to_lon180(lons)
+        locs = np.vstack((lons, lats)).T
+
+        return nvessels, vessel_ix, locs
+
     def _calc_breach_prob_per_particle(
         self,
         shorezone: ShoreZone,
         convert_lon: bool = True,
+        ds: Optional[xr.Dataset] = None
     ) -> np.ndarray:
         """Return probability of a vessel breaching and spilling oil based on coastline data.
 
@@ -217,40 +319,31 @@ class DriftResult:
         ----------
         shorezone: ShoreZone
             Shorezone data container object.
+        convert_lon: bool
+            Convert longitude values from 0 to 360 to -180 to 180. (Default: True)
+        ds: xarray.Dataset
+            Simulation results already read from `path`. (Default: None)
 
         Returns
         -------
         breach_prob: np.ndarray
             Probability of breaching and spilling oil for each particle / vessel.
         """
-        with xr.open_dataset(self.path) as ds:
-            stranded_flag = utils.get_stranded_flag_from_status(ds)
-            nvessels = len(ds.trajectory)
-            breach_prob_per_particle = np.zeros((nvessels,))
-
-            # Get indices in dataset of where vessels are stranded
-            stranded = ds.status.values == stranded_flag
-            stranded_ix = np.argwhere(stranded)
-            vessel_ix = stranded_ix[:, 0]
-            time_ix = stranded_ix[:, 1]
-
-            # Get stranding locations from dataset using indices
-            lons = ds.lon.values[vessel_ix, time_ix]
-            if convert_lon:
-                lons = utils.lon360_to_lon180(lons)
-            lats = ds.lat.values[vessel_ix, time_ix]
-            locs = np.vstack((lons, lats)).T
+        nvessels, vessel_ix, locs = self._get_stranded_locs(convert_lon, ds)
+        breach_prob_per_particle = np.zeros((nvessels,))
         breach_prob_per_particle[vessel_ix] = shorezone.get_breach_prob(locs)
 
         return breach_prob_per_particle
 
-    def _calc_pt_per_particle(self, ais: AIS, **kwargs) -> np.ndarray:
+    def _calc_pt_per_particle(self, ais: AIS, ds: Optional[xr.Dataset] = None, **kwargs) -> np.ndarray:
         """Return probability of vessel at release point at start of simulation (`pt`).
 
         Parameters
         ----------
         ais: AIS
             AIS data container object.
+        ds: xarray.Dataset
+            Simulation results already read from `path`. (Default: None)
 
         Returns
         -------
@@ -258,86 +351,129 @@ class DriftResult:
             Probability of vessel at release point at start of simulation.
         """
         # Get starting position of very particle (drifting vessel)
-        starting_points = self._get_starting_points(**kwargs)
-        locs = np.vstack((starting_points.lon.values, starting_points.lat.values)).T
+        lon, lat = self._get_starting_locs(ds=ds, **kwargs)
+        locs = np.vstack((lon, lat)).T
 
         # Find vessel count in AIS data from starting positing
-        _, ix = ais.tree.query(locs)
-        starting_counts = ais.vessel_counts.iloc[ix].counts.values
+        # - Query all points at once, split across all available cores
+        # - Particles further than `ais.max_distance` from any cell with vessels are not
+        #   searched further and have no vessels (index is out of range, distance is inf)
+        dist, ais_ix = ais.tree.query(locs, distance_upper_bound=ais.max_distance, workers=-1)
+        starting_counts = np.where(
+            np.isfinite(dist),
+            ais.counts[np.minimum(ais_ix, len(ais.counts) - 1)],
+            0
+        )
 
         # Pt is probability that a vessel is at the release point for the month.
         # - If there were more vessels than days of the month, make Pt = 1
-        ndays_in_month = calendar.monthrange(ais.date.year, ais.date.month)[1]
-        pt = starting_counts / ndays_in_month
-        pt[pt > 1] = 1
+        pt = starting_counts / ais.ndays_in_month
+        np.minimum(pt, 1, out=pt)
 
         return pt
 
-    def _get_stranded_per_esi_segment(self, esi: ESI, **kwargs) -> pd.DataFrame:
+    def _get_stranded_per_esi_segment(
+        self,
+        esi: ESI,
+        esi_codes: Optional[np.ndarray] = None,
+        **kwargs
+    ) -> pd.DataFrame:
         """Return the number of stranded vessels per ESI segment.
 
         Parameters
         ----------
         esi: ESI
             ESI data container object.
+        esi_codes: np.ndarray
+            ESI segment code for each vessel, looked up from `esi` if not given. (Default: None)
 
         Returns
         -------
         stranded_vessels_per_esi_segment: pandas.DataFrame
             Number of stranded vessels per ESI segment.
         """
-        esi_ids = self._get_esi_per_particle(esi, **kwargs)
+        if esi_codes is None:
+            esi_codes = self._get_esi_code_per_particle(esi, **kwargs)
+
+        # Only keep segments where vessels stranded
+        counts = self._count_stranded_per_segment_code(esi, esi_codes)
+        codes = np.flatnonzero(counts)
+
+        return pd.DataFrame({'nstranded': counts[codes]}, index=esi.segment_ids[codes])
 
-        counts: DefaultDict[str, int] = defaultdict(int)
-        for id in esi_ids:
-            if id == '':
-                continue
-            counts[id] += 1
+    def _count_stranded_per_segment_code(self, esi: ESI, esi_codes: np.ndarray) -> np.ndarray:
+        """Return the number of stranded vessels for every ESI segment code.
 
-        return pd.DataFrame({'nstranded': counts.values()}, index=counts.keys())
+        Parameters
+        ----------
+        esi: ESI
+            ESI data container object.
+        esi_codes: np.ndarray
+            ESI segment code for each vessel.
 
-    def _calc_pb_per_esi_segment(self, esi: ESI, **kwargs) -> pd.DataFrame:
+        Returns
+        -------
+        nstranded: np.ndarray
+            Number of stranded vessels indexed by ESI segment code.
+        """
+        # Non-stranded particles (-1) are skipped
+        return np.bincount(esi_codes[esi_codes >= 0], minlength=len(esi.segment_ids))
+
+    def _calc_pb_per_esi_segment(
+        self,
+        esi: ESI,
+        esi_codes: Optional[np.ndarray] = None,
+        **kwargs
+    ) -> pd.DataFrame:
         """Return probability vessel drifted and stranded on coastline.
 
         Parameters
         ----------
         esi: ESI
             ESI data container object.
+        esi_codes: np.ndarray
+            ESI segment code for each vessel, looked up from `esi` if not given. (Default: None)
 
         Returns
         -------
         pb: pandas.DataFrame
             Probability of vessel drifting and stranded on coastline indexed by ESI segment.
         """
-        stranded_by_esi = self._get_stranded_per_esi_segment(esi, **kwargs)
+        stranded_by_esi = self._get_stranded_per_esi_segment(esi, esi_codes, **kwargs)
         pb_s = stranded_by_esi / stranded_by_esi.sum()
         pb_s.rename(columns={'nstranded': 'pb_s'}, inplace=True)
 
         return pb_s
 
-    def _calc_pb_per_particle(self, esi: ESI, **kwargs) -> np.ndarray:
+    def _calc_pb_per_particle(
+        self,
+        esi: ESI,
+        esi_codes: Optional[np.ndarray] = None,
+        **kwargs
+    ) -> np.ndarray:
         """Return `pb` of ESI segment where vessel stranded.
 
         Parameters
         ----------
         esi: ESI
             ESI data container object.
+        esi_codes: np.ndarray
+            ESI segment code for each vessel, looked up from `esi` if not given. (Default: None)
 
         Returns
         -------
         pb: np.ndarray
             `pb` of ESI segment where vessel stranded.
         """
-        # Array of segments IDs per particle ('' if not stranded)
-        esi_per_particle = self._get_esi_per_particle(esi, **kwargs)
-        # DataFrame of pb_s (indexed by esi_id)
-        pb_per_segment = self._calc_pb_per_esi_segment(esi, **kwargs)
-        # Map esi_per_particle to pb_per_segment
-        # - Unable to use esi_per_particle because it includes empty ESI IDs ('') for non-stranded particles
-        # - Add a row for non-stranded particles with pb_s = 0
-        pb_non_stranded = pd.DataFrame({'pb_s': 0}, index=[''])
-        pb_per_segment_patched = pb_per_segment.append(pb_non_stranded)
-        pb_per_particle = np.squeeze(pb_per_segment_patched.loc[esi_per_particle].values)
+        # Array of segment codes per particle (-1 if not stranded)
+        if esi_codes is None:
+            esi_codes = self._get_esi_code_per_particle(esi, **kwargs)
+        # Array of pb_s (indexed by segment code)
+        nstranded = self._count_stranded_per_segment_code(esi, esi_codes)
+        pb_per_segment = nstranded / max(nstranded.sum(), 1)
+        # Map esi_codes to pb_per_segment
+        # - Non-stranded particles (-1) have pb_s = 0
+        pb_per_particle = np.where(esi_codes >= 0, pb_per_segment[esi_codes], 0.0)
 
         return pb_per_particle
 
@@ -345,7 +481,8 @@ class DriftResult:
         self,
         esi: ESI,
         dtype: str = 'U15',
-        convert_lon: bool = True
+        convert_lon: bool = True,
+        ds: Optional[xr.Dataset] = None
     ) -> np.ndarray:
         """Return ESI segment for each vessel.
 
@@ -357,35 +494,53 @@ class DriftResult:
             Data type of ESI segment IDs. (Default: 'U15')
         convert_lon: bool
             Convert longitude values from 0 to 360 to -180 to 180. (Default: True)
+        ds: xarray.Dataset
+            Simulation results already read from `path`. (Default: None)
 
         Returns
         -------
         esi_ids: np.ndarray
             ESI segment for each vessel.
         """
-        with xr.open_dataset(self.path) as ds:
-            stranded_flag = utils.get_stranded_flag_from_status(ds)
-            nvessels = len(ds.trajectory)
-            esi_id_per_particle = np.empty(nvessels, dtype=dtype)
+        esi_codes = self._get_esi_code_per_particle(esi, convert_lon, ds)
 
-            # Get indices in dataset of where vessels are stranded
-            stranded = ds.status.values == stranded_flag
-            stranded_ix = np.argwhere(stranded)
-            vessel_ix = stranded_ix[:, 0]
-            time_ix = stranded_ix[:, 1]
+        # Non-stranded particles are left as empty ESI IDs ('')
+        esi_id_per_particle = np.empty(len(esi_codes), dtype=dtype)
+        stranded = esi_codes >= 0
+        esi_id_per_particle[stranded] = esi.segment_ids.to_numpy()[esi_codes[stranded]]
 
-            # Get stranding locations from dataset using indices
-            lons = ds.lon.values[vessel_ix, time_ix]
-            if convert_lon:
-                lons = utils.lon360_to_lon180(lons)
-            lats = ds.lat.values[vessel_ix, time_ix]
-            locs = np.vstack((lons, lats)).T
+        return esi_id_per_particle
 
-        # Find ESI segment id using stranding locations
-        _, ix = esi.tree.query(locs)
-        esi_id_per_particle[vessel_ix] = esi.locs.iloc[ix].esi_id.values
+    def _get_esi_code_per_particle(
+        self,
+        esi: ESI,
+        convert_lon: bool = True,
+        ds: Optional[xr.Dataset] = None
+    ) -> np.ndarray:
+        """Return ESI segment code for each vessel.
 
-        return esi_id_per_particle
+        Parameters
+        ----------
+        esi: ESI
+            ESI data container object.
+        convert_lon: bool
+            Convert longitude values from 0 to 360 to -180 to 180. (Default: True)
+        ds: xarray.Dataset
+            Simulation results already read from `path`. (Default: None)
+
+        Returns
+        -------
+        esi_codes: np.ndarray
+            ESI segment code (see `ESI.segment_ids`) for each vessel, -1 if vessel did not strand.
+        """
+        nvessels, vessel_ix, locs = self._get_stranded_locs(convert_lon, ds)
+        esi_code_per_particle = np.full(nvessels, -1, dtype=np.int64)
+
+        # Find ESI segment code using stranding locations
+        _, ix = esi.tree.query(locs, workers=-1)
+        esi_code_per_particle[vessel_ix] = esi.segment_codes[ix]
+
+        return esi_code_per_particle
 
 
 class DriftResultsSet:
@@ -406,25 +561,88 @@ class DriftResultsSet:
         vessel_type: str,
         ais_set: AISSet,
         esi: ESI,
-        shorezone: ShoreZone
+        shorezone: ShoreZone,
+        nworkers: int = 1
     ) -> pd.DataFrame:
-        """Load all available results."""
+        """Load all available results.
+
+        Result files are independent, so with `nworkers` > 1 they are loaded in a pool of processes.
+        """
         vessel_specific_paths = [p for p in self.paths if p.name.startswith(vessel_type)]
-        results = []
-        for path in vessel_specific_paths:
-            # load AIS data used to init this simulation
-            start_date = get_sim_start_date(path)
-            ais_path = ais_set.get_ais_path(vessel_type, start_date)
-            ais = AIS(ais_path)
-
-            tmp_results = DriftResult(path, ais, esi, shorezone)
-            # add date as column to provide ability to group by date
-            tmp_results.data['date'] = tmp_results.data.attrs['start_date']
-            # vessel type is also useful when combining results from multiple vessel types
-            tmp_results.data['vessel_type'] = vessel_type
-            results.append(tmp_results)
-
-        return pd.concat([r.data for r in results], ignore_index=True)
+        if nworkers > 1 and len(vessel_specific_paths) > 1:
+            # Load each month's AIS once in this process (writing its cache, if any) before starting
+            # workers, so workers receive loaded AIS instead of all reading the same raster at once
+            for path in vessel_specific_paths:
+                ais_set.get_ais(vessel_type, get_sim_start_date(path))
+
+            # ESI and ShoreZone are large, so send them once per worker instead of once per file
+            with ProcessPoolExecutor(
+                max_workers=min(nworkers, len(vessel_specific_paths)),
+                initializer=_init_load_worker,
+                initargs=(ais_set, esi, shorezone)
+            ) as executor:
+                results = list(executor.map(_load_worker_result, vessel_specific_paths, repeat(vessel_type)))
+        else:
+            results = [
+                load_drift_result(path, vessel_type, ais_set, esi, shorezone)
+                for path in vessel_specific_paths
+            ]
+
+        return pd.concat(results, ignore_index=True)
+
+
+# Data shared by every file loaded in a worker process of `DriftResultsSet.load_results`
+_load_worker_data: dict = {}
+
+
+def _init_load_worker(ais_set: AISSet, esi: ESI, shorezone: ShoreZone) -> None:
+    """Store data needed to load drift results in worker process."""
+    _load_worker_data.update(ais_set=ais_set, esi=esi, shorezone=shorezone)
+
+
+def _load_worker_result(path: Path, vessel_type: str) -> pd.DataFrame:
+    """Load drift result in worker process."""
+    return load_drift_result(path, vessel_type, **_load_worker_data)
+
+
+def load_drift_result(
+    path: Path,
+    vessel_type: str,
+    ais_set: AISSet,
+    esi: ESI,
+    shorezone: ShoreZone
+) -> pd.DataFrame:
+    """Given a Path to a drift simulation result, return drift hazard terms with date and vessel type.
+
+    Parameters
+    ----------
+    path: Path
+        Path to drift simulation results
+    vessel_type: str
+        The vessel type
+    ais_set: AISSet
+        AIS data used to initialize simulations.
+    esi: ESI
+        ESI data container object.
+    shorezone: ShoreZone
+        Shorezone data container object.
+
+    Returns
+    -------
+    drift_hazard: pandas.DataFrame
+        `DriftResult.data` with `date` and `vessel_type` columns.
+    """
+    # load AIS data used to init this simulation
+    start_date = get_sim_start_date(path)
+    ais = ais_set.get_ais(vessel_type, start_date)
+
+    result = DriftResult(path, ais, esi, shorezone)
+    # add date as column to provide ability to group by date
+    result.data['date'] = result.data.attrs['start_date']
+    # vessel type is also useful when combining results from multiple vessel types
+    result.data['vessel_type'] = vessel_type
+
+    return result.data
 
 
 def get_vessel_type(drift_result_path: Path) -> str:
@@ -4,9 +4,9 @@ from pathlib import Path
 import geopandas as gpd
 import numpy as np
 import pandas as pd
-from scipy.spatial import cKDTree
 
 from .grs import GRS
+from .utils import KDTree
 
 
 class ESI:
@@ -21,8 +21,12 @@ class ESI:
         ESI data
     locs: pandas.DataFrame
         Points along every ESI segment including segment identifier (esi_id) and ESI code (esi_code)
-    tree: scipy.spatial.cKDTree
+    tree: vessel_drift_analysis.utils.KDTree
         Tree to query closest ESI point to look up ESI segment identifier and ESI code
+    segment_codes: np.ndarray
+        Integer code of the ESI segment for every point in `locs`
+    segment_ids: pandas.Index
+        ESI segment identifier (esi_id) for each integer code in `segment_codes`
     """
     def __init__(self, fpath: Path):
         self.path = fpath
@@ -31,7 +35,9 @@ class ESI:
         # Need tree + location lookup because gpd.query only looks over overlapping features
         # - Get (lon, lat) of every point in the geometry column to make a tree
         self.locs = esi_to_locs(self.gdf)
-        self.tree = cKDTree(np.vstack((self.locs.lon.values, self.locs.lat.values)).T)
+        self.tree = KDTree(np.vstack((self.locs.lon.values, self.locs.lat.values)).T)
+        # Integer codes for ESI segments are much cheaper to compare and count than esi_id strings
+        self.segment_codes, self.segment_ids = self.locs.esi_id.factorize()
 
     def get_grs_region_for_each_row(self, grs: GRS) -> np.ndarray:
         """Given GRS data container, return GRS code for each row in ESI data as array"""
@@ -100,12 +106,19 @@ def get_esi_npoints(gdf: gpd.GeoDataFrame) -> int:
 
 
 def clean_esi_code(esi_column: pd.Series) -> np.ndarray:
-    """Given column of ESI codes, clean values, remove letters and return as integer array."""
-    cleaned_esi_codes = np.zeros(len(esi_column), dtype='i2')
-    for i, row in esi_column.iterrows():
-        cleaned_esi_codes[i] = clean_esi_string(row)
+    """Given column of ESI codes, clean values, remove letters and return as integer array.
 
-    return cleaned_esi_codes
+    Notes:
+    - There are few distinct ESI strings, so each is only cleaned once then gathered for every row
+    - Missing codes (factorized as -1) take the last value, the cleaned value for no code
+    """
+    codes, esi_strings = pd.factorize(esi_column)
+    cleaned_esi_strings = np.array(
+        [clean_esi_string(esi) for esi in esi_strings] + [clean_esi_string(None)],
+        dtype='i2'
+    )
+
+    return cleaned_esi_strings[codes]
 
 
 def esi_to_locs(esi: gpd.GeoDataFrame) -> pd.DataFrame:
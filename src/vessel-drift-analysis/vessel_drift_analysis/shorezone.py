@@ -4,7 +4,8 @@ from pathlib import Path
 import geopandas as gpd
 import numpy as np
 import pandas as pd
-from scipy.spatial import cKDTree
+
+from .utils import KDTree
 
 
 class ShoreZone:
@@ -19,7 +20,7 @@ class ShoreZone:
         Shorezone data.
     locs: pandas.DataFrame
         Points along every Shorezone segment including shorezone classification.
-    tree: scipy.spatial.cKDTree
+    tree: vessel_drift_analysis.utils.KDTree
         Tree to query closest Shorezone point to look up shorezone classification.
     """
 
@@ -30,7 +31,7 @@ class ShoreZone:
         # Need tree + location lookup because gpd.query only looks over overlapping features
         # - Get (lon, lat) of every point in the geometry column to make a tree
         self.locs = shorezone_to_locs(self.gdf)
-        self.tree = cKDTree(np.vstack((self.locs.lon.values, self.locs.lat.values)).T)
+        self.tree = KDTree(np.vstack((self.locs.lon.values, self.locs.lat.values)).T)
 
     def get_breach_prob(self, query_points: np.ndarray) -> np.ndarray:
         """Return probability of breaching based on Shorezone classification.
@@ -54,7 +55,7 @@ class ShoreZone:
         ..[1] https://incidentnews.noaa.gov
         """
         # Get Shorezone classification (bc_class) for each point
-        _, ix = self.tree.query(query_points)
+        _, ix = self.tree.query(query_points, workers=-1)
         bc_classes = self.locs.iloc[ix].bc_class.values
 
         # Convert stranding locations to probabilities that vessel will breach
@@ -1,7 +1,6 @@
 # Container for spill result simulations
 import datetime
 import warnings
-from collections import defaultdict
 from pathlib import Path
 from typing import Union
 
@@ -114,15 +113,15 @@ class SpillResult:
         oil_mass = self._get_oil_mass_per_particle()
         esi_ids = self._get_esi_per_particle(esi, **kwargs)
 
-        oil_mass_by_esi = defaultdict(float)
-        particles_by_esi = defaultdict(int)
-        for mass, id in zip(oil_mass, esi_ids):
-            if id == '':
-                continue
-            # Get sum of mass of oil spilled in each ESI segment
-            oil_mass_by_esi[id] += mass
-            # Count all particles that landed in each ESI segment
-            particles_by_esi[id] += 1
+        # Sum oil mass and count particles that landed in each ESI segment
+        # - np.unique labels each stranded particle with its segment, so both are single C loops
+        stranded = esi_ids != ''
+        segment_ids, segment_ix, particle_count_per_esi = np.unique(
+            esi_ids[stranded],
+            return_inverse=True,
+            return_counts=True
+        )
+        oil_mass_by_esi = np.bincount(segment_ix, weights=oil_mass[stranded], minlength=len(segment_ids))
 
         # From Sepp-Neves (2016):
         # "Cs is the concentration index, defined as the ensemble mean concentration
@@ -130,17 +129,15 @@ class SpillResult:
         # value found in the domain."
         # Here we are using mass of oil and we have a length of coastline, not an area.
         # So, we will use the ESI segment length in the shape files to normalize this.
-        oil_mass = np.fromiter(oil_mass_by_esi.values(), dtype=float)
 
         # Oil mass is not a concentration, so we use the length of the ESI segment to convert it
         # to Mass / Length that it becomes a concentration.
         # Units of length not provided in data. Since it is is a normalizing factor, the units
         # are not important, but this does limit interpretability.
         esi_indexed = esi.gdf.set_index('esi_id')
-        esi_segment_length = esi_indexed.loc[particles_by_esi.keys()].length
-        oil_concentration = oil_mass / esi_segment_length
+        esi_segment_length = esi_indexed.loc[segment_ids].length
+        oil_concentration = oil_mass_by_esi / esi_segment_length
 
-        particle_count_per_esi = np.fromiter(particles_by_esi.values(), dtype=int)
         ensemble_mean_concentration = oil_concentration / particle_count_per_esi
         cs = ensemble_mean_concentration / oil_concentration.max()
 
@@ -149,11 +146,11 @@ class SpillResult:
 
         df = pd.DataFrame(
             {
-                'oil_mass': oil_mass_by_esi.values(),
+                'oil_mass': oil_mass_by_esi,
                 'cs': cs.values,
                 'pb': pb,
                 'particle_hits': particle_count_per_esi,
-                'esi_id': oil_mass_by_esi.keys(),
+                'esi_id': segment_ids,
             },
             index=np.arange(len(cs))
         )
@@ -180,9 +177,7 @@ class SpillResult:
             # Get indices in dataset of where particles beached / stranded
             stranded_flag = utils.get_stranded_flag_from_status(ds)
             stranded = ds.status.values == stranded_flag
-            stranded_ix = np.argwhere(stranded)
-            particle_ix = stranded_ix[:, 0]
-            time_ix = stranded_ix[:, 1]
+            particle_ix, time_ix = np.nonzero(stranded)
 
             nvessels = len(ds.trajectory)
             oil_mass_per_particle = np.empty(nvessels)
@@ -219,9 +214,7 @@ class SpillResult:
 
             # Get indices in dataset of where vessels are stranded
             stranded = ds.status.values == stranded_flag
-            stranded_ix = np.argwhere(stranded)
-            vessel_ix = stranded_ix[:, 0]
-            time_ix = stranded_ix[:, 1]
+            vessel_ix, time_ix = np.nonzero(stranded)
 
             # Get stranding locations from dataset using indices
             lons = ds.lon.values[vessel_ix, time_ix]
@@ -231,8 +224,9 @@ class SpillResult:
             locs = np.vstack((lons, lats)).T
 
         # Find ESI segment id using stranding locations
-        _, ix = esi.tree.query(locs)
-        esi_id_per_particle[vessel_ix] = esi.locs.iloc[ix].esi_id.values
+        _, ix = esi.tree.query(locs, workers=-1)
+        # - Gather through integer segment codes instead of pandas iloc on the ESI points
+        esi_id_per_particle[vessel_ix] = esi.segment_ids.to_numpy()[esi.segment_codes[ix]]
 
         return esi_id_per_particle
 
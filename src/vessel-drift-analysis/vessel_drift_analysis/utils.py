@@ -1,6 +1,66 @@
 # Convenience functions for working with the data
 import numpy as np
 import xarray as xr
+from scipy.spatial import cKDTree
+
+try:
+    from pykdtree.kdtree import KDTree as PyKDTree
+except ImportError:
+    PyKDTree = None
+
+
+class KDTree:
+    """
+    Nearest neighbor lookup tree for (lon, lat) points.
+
+    Uses pykdtree when installed because it builds trees several times faster than scipy,
+    otherwise falls back to scipy.spatial.cKDTree.  Queries behave like cKDTree.query with k=1
+    for either backend.
+
+    Attributes:
+    -----------
+    data: np.ndarray
+        (N, 2) array of points in the tree.
+    """
+    def __init__(self, data: np.ndarray):
+        self.data = np.ascontiguousarray(data)
+        if PyKDTree is not None:
+            self._tree = PyKDTree(self.data)
+        else:
+            self._tree = cKDTree(self.data)
+
+    def __getstate__(self) -> dict:
+        # pykdtree trees cannot be pickled, so only send the points and rebuild the tree on load
+        return {'data': self.data}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['data'])
+
+    def query(self, x: np.ndarray, distance_upper_bound: float = np.inf, workers: int = 1):
+        """Return (distance, index) of the nearest point in the tree for each point in `x`.
+
+        Points further than `distance_upper_bound` from the tree have a distance of inf and
+        an index of `len(data)`.
+
+        Notes:
+        - pykdtree is already multi-threaded and does not take `workers`, so it is ignored
+        - pykdtree only takes (N, 2) arrays with the same dtype as the tree, so `x` is cast to match
+        """
+        if PyKDTree is None:
+            try:
+                return self._tree.query(x, distance_upper_bound=distance_upper_bound, workers=workers)
+            except TypeError:
+                # scipy < 1.6 named this argument `n_jobs`
+                return self._tree.query(x, distance_upper_bound=distance_upper_bound, n_jobs=workers)
+
+        # pykdtree uses None instead of inf for no upper bound
+        bound = None if np.isinf(distance_upper_bound) else distance_upper_bound
+        x = np.asarray(x, dtype=self.data.dtype)
+        if x.ndim == 1:
+            dist, ix = self._tree.query(x[np.newaxis, :], distance_upper_bound=bound)
+            return dist[0], ix[0]
+
+        return self._tree.query(np.ascontiguousarray(x), distance_upper_bound=bound)
 
 
 def lon360_to_lon180(lon: np.ndarray) -> np.ndarray: